@@ -1,36 +1,778 @@
+import io
 import json
+import mmap
+import os
+import struct
 import sys
+import time
 import argparse
-from datetime import datetime
-from prettytable import PrettyTable
-import csv
+from array import array
+from contextlib import ExitStack, contextmanager, redirect_stderr, redirect_stdout
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
+from decimal import Decimal, ROUND_HALF_UP
+from itertools import islice
+
+# csv, gzip, sqlite3, socket and shlex are imported by the commands that use
+# them, so everyday commands like `add` don't pay for them at start-up
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, writers are not serialised
+    fcntl = None
 
 # File paths for storing expenses and budgets
 EXPENSE_FILE = "cart_list.json"
+COLUMNAR_FILE = "cart_list.cols"
+JOURNAL_FILE = "cart_list.journal"
+INDEX_FILE = "cart_index.json"
+INDEX_FORMAT = 4
 BUDGET_FILE = "monthly_budget.json"
+LOCK_FILE = "cart_list.lock"
+OFFSETS_FILE = "cart_list.idx"
+SOCKET_FILE = os.environ.get('EXPENSE_SOCKET', "cart_list.sock")
 
-def load_expenses():
+# One fixed-size slot per expense ID in OFFSETS_FILE: byte offset and length
+# of the record and the file it lives in. Slot 0 holds the store version the
+# slots are valid for (IDs start at 1).
+OFFSET_SLOT = struct.Struct('<QIB3x')
+SOURCE_NONE, SOURCE_SNAPSHOT, SOURCE_JOURNAL, SOURCE_COLUMNAR = 0, 1, 2, 3
+
+# Columnar snapshot: magic, header length, JSON header, then 8-byte aligned
+# columns (typecode, file offset and item count listed in the header)
+COLUMNAR_MAGIC = b"EXPCOLS1"
+COLUMNAR_PREFIX = struct.Struct('<8sQ')
+
+# Fold the journal back into the snapshot once it grows past this many bytes
+JOURNAL_COMPACT_BYTES = 1024 * 1024
+
+# Rows fetched, written or imported per batch by export and import
+BATCH_SIZE = 10000
+
+# `serve` keeps the store locked while commands keep arriving and flushes
+# their commits once it has been idle this long, or held it this long
+FLUSH_DELAY = 0.25
+FLUSH_MAX_HOLD = 2.0
+
+# Default soft and hard budget thresholds, in percent of the month's budget:
+# `add` warns once spending reaches the first and refuses to go past the second
+BUDGET_WARN_PERCENT = 80
+BUDGET_HARD_PERCENT = 100
+
+CSV_FIELDS = ["id", "date", "description", "amount", "category"]
+
+# Header, expense key, fixed width and formatter of each `list` column
+LIST_COLUMNS = [
+    ("ID", 'id', 8, str),
+    ("Date", 'date', 10, str),
+    ("Description", 'description', 30, str),
+    ("Amount", 'amount', 12, lambda amount: f"$ {amount:.2f}"),
+    ("Category", 'category', 14, str),
+]
+
+def show_money(amount):
+    return "-" if amount is None else f"$ {amount:.2f}"
+
+# Columns of `budget status`, in the same layout as LIST_COLUMNS
+BUDGET_COLUMNS = [
+    ("Month", 'month', 7, str),
+    ("Budget", 'budget', 12, show_money),
+    ("Spent", 'spent', 12, show_money),
+    ("Remaining", 'remaining', 12, show_money),
+    ("Used", 'used', 6, lambda used: f"{used}%"),
+    ("Status", 'status', 7, str),
+]
+
+def to_cents(value):
+    """
+    Convert an amount (string, int, float or Decimal) to integer cents,
+    rounding half up. Raises ValueError if it is not a finite number that
+    fits the 64-bit columns.
+    """
+    try:
+        cents = int((Decimal(str(value).strip()) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    except ArithmeticError:
+        # InvalidOperation (not a number, NaN, infinity) or Overflow
+        raise ValueError(f"invalid amount {value!r}")
+    if abs(cents) >= 2 ** 63:
+        raise ValueError(f"amount {value!r} is out of range")
+    return cents
+
+def from_cents(cents):
+    """
+    Return integer cents as a Decimal with two places (e.g. Decimal('12.30')).
+    """
+    return Decimal(cents).scaleb(-2)
+
+def normalize_expense(expense):
+    """
+    Convert a record saved before amounts were kept in cents, in place.
     """
-    Load the list of expenses from the JSON file.
+    if 'amount' in expense:
+        fields = [(key, value) if key != 'amount' else ('cents', to_cents(value))
+                  for key, value in expense.items()]
+        expense.clear()
+        expense.update(fields)
+    return expense
+
+def public_expense(expense):
+    """
+    Return an expense as shown to users and other tools, with a Decimal
+    'amount' in place of the stored cents.
+    """
+    return {
+        'id': expense['id'],
+        'date': expense['date'],
+        'description': expense['description'],
+        'amount': from_cents(expense['cents']),
+        'category': expense['category'],
+    }
+
+def atomic_write_json(path, data, indent=2):
+    """
+    Write JSON to a temporary file and rename it over `path`.
+    A crash mid-write leaves the previous file intact.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+@contextmanager
+def locked(path):
+    """
+    Hold an exclusive advisory lock on `path` for the duration of the block.
+    """
+    with open(path, 'a') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def align8(size):
+    return (size + 7) & ~7
+
+class ColumnarSnapshot:
+    """
+    Read-only view of a columnar snapshot, memory-mapped so columns are
+    only paged in when used: expense IDs, day ordinals and amounts in cents
+    as integer columns, with categories and descriptions dictionary-encoded
+    into string tables.
+    """
+
+    def __init__(self, path=COLUMNAR_FILE):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, header_size = COLUMNAR_PREFIX.unpack_from(self._map)
+        if magic != COLUMNAR_MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a columnar expense snapshot")
+        header = json.loads(self._map[COLUMNAR_PREFIX.size:COLUMNAR_PREFIX.size + header_size])
+        if header['byteorder'] != sys.byteorder:
+            self._map.close()
+            raise ValueError(f"{path} was written on a machine with a different byte order")
+        self.categories = header['categories']
+        self.odd_dates = {int(row): value for row, value in header['odd_dates'].items()}
+        self._views = []
+        for name, (typecode, offset, count) in header['columns'].items():
+            view = memoryview(self._map)[offset:offset + count * array(typecode).itemsize].cast(typecode)
+            self._views.append(view)
+            setattr(self, name, view)
+        self._dates = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for view in self._views:
+            view.release()
+        self._views = []
+        self._map.close()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def find(self, expense_id):
+        """
+        Return the row holding `expense_id`, or None (IDs are sorted).
+        """
+        row = bisect_left(self.ids, expense_id)
+        return row if row < len(self.ids) and self.ids[row] == expense_id else None
+
+    def date(self, row):
+        ordinal = self.days[row]
+        if not ordinal:
+            return self.odd_dates.get(row)
+        if ordinal not in self._dates:
+            self._dates[ordinal] = date.fromordinal(ordinal).isoformat()
+        return self._dates[ordinal]
+
+    def description(self, row):
+        code = self.description_codes[row]
+        return self.descriptions[self.description_offsets[code]:self.description_offsets[code + 1]].tobytes().decode('utf-8')
+
+    def row(self, row):
+        return {
+            'id': self.ids[row],
+            'date': self.date(row),
+            'description': self.description(row),
+            'cents': self.cents[row],
+            'category': self.categories[self.category_codes[row]],
+        }
+
+    def __iter__(self):
+        return map(self.row, range(len(self)))
+
+    def group_totals(self):
+        """
+        Return {(day ordinal, category code): cents} over the whole snapshot,
+        reduced straight from the integer columns without building rows.
+        Rows with unreadable dates are grouped under ordinal 0.
+        """
+        totals = {}
+        for key, cents in zip(zip(self.days, self.category_codes), self.cents):
+            totals[key] = totals.get(key, 0) + cents
+        return totals
+
+def write_columnar(expenses):
+    """
+    Atomically write `expenses` (any iterable) as a columnar snapshot,
+    sorted by ID, and return the (id, row, 0, SOURCE_COLUMNAR) slot of
+    each expense.
+    """
+    expenses = sorted(expenses, key=lambda expense: expense['id'])
+    categories, descriptions, odd_dates = {}, {}, {}
+    columns = {
+        'ids': array('q'),
+        'days': array('i'),
+        'cents': array('q'),
+        'category_codes': array('I'),
+        'description_codes': array('I'),
+    }
+    for row, expense in enumerate(expenses):
+        columns['ids'].append(expense['id'])
+        ordinal = day_ordinal(expense['date'])
+        if ordinal is None:
+            odd_dates[row] = expense['date']
+        columns['days'].append(ordinal or 0)
+        columns['cents'].append(expense['cents'])
+        columns['category_codes'].append(categories.setdefault(expense['category'], len(categories)))
+        columns['description_codes'].append(descriptions.setdefault(str(expense['description']), len(descriptions)))
+    encoded = [description.encode('utf-8') for description in descriptions]
+    columns['description_offsets'] = array('q', [0])
+    for text in encoded:
+        columns['description_offsets'].append(columns['description_offsets'][-1] + len(text))
+    columns['descriptions'] = array('B', b''.join(encoded))
+
+    header = {
+        'byteorder': sys.byteorder,
+        'rows': len(expenses),
+        'categories': list(categories),
+        'odd_dates': odd_dates,
+    }
+    # Columns start after the header, whose length depends on their offsets:
+    # grow the data start until the header fits in front of it
+    data_start, header_bytes = 0, b''
+    while COLUMNAR_PREFIX.size + len(header_bytes) > data_start or not header_bytes:
+        data_start = align8(COLUMNAR_PREFIX.size + len(header_bytes))
+        layout, position = {}, data_start
+        for name, column in columns.items():
+            layout[name] = [column.typecode, position, len(column)]
+            position = align8(position + len(column) * column.itemsize)
+        header['columns'] = layout
+        header_bytes = json.dumps(header).encode('utf-8')
+
+    tmp_path = f"{COLUMNAR_FILE}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(COLUMNAR_PREFIX.pack(COLUMNAR_MAGIC, len(header_bytes)))
+        f.write(header_bytes)
+        for name, column in columns.items():
+            f.write(b'\0' * (layout[name][1] - f.tell()))
+            column.tofile(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, COLUMNAR_FILE)
+    return [(expense_id, row, 0, SOURCE_COLUMNAR) for row, expense_id in enumerate(columns['ids'])]
+
+def load_snapshot():
+    """
+    Load the compacted list of expenses from the snapshot file (columnar if
+    there is one, JSON otherwise).
     Returns an empty list if the file doesn't exist or is invalid.
     """
+    if os.path.exists(COLUMNAR_FILE):
+        with ColumnarSnapshot() as snapshot:
+            return list(snapshot)
     try:
         with open(EXPENSE_FILE, 'r') as f:
-            return json.load(f)
+            return [normalize_expense(expense) for expense in json.load(f)]
     except (FileNotFoundError, json.JSONDecodeError):
         return []
 
-def save_expenses(expenses):
+def read_journal():
     """
-    Save the list of expenses to the JSON file.
-    Prints an error if saving fails.
+    Yield the records appended to the journal since the last compaction.
+    A torn trailing line left by a crash is skipped.
     """
     try:
-        with open(EXPENSE_FILE, 'w') as f:
-            json.dump(expenses, f, indent=2)
+        with open(JOURNAL_FILE, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get('op') == 'add':
+                    normalize_expense(record['expense'])
+                yield record
+    except FileNotFoundError:
+        return
+
+def append_journal(*records):
+    """
+    Append add/delete records to the journal and flush them to disk.
+    Returns the (offset, length) of each record's line.
+    """
+    lines = [json.dumps(record).encode('utf-8') + b'\n' for record in records]
+    with open(JOURNAL_FILE, 'ab') as f:
+        offset = f.tell()
+        # Terminate a torn line from an earlier crash so this record stays parseable
+        if offset > 0:
+            with open(JOURNAL_FILE, 'rb') as tail:
+                tail.seek(-1, os.SEEK_END)
+                if tail.read(1) != b'\n':
+                    f.write(b'\n')
+                    offset += 1
+        f.write(b''.join(lines))
+        f.flush()
+        os.fsync(f.fileno())
+    positions = []
+    for line in lines:
+        positions.append((offset, len(line) - 1))
+        offset += len(line)
+    return positions
+
+def journal_changes():
+    """
+    Return {id: expense} for every ID the journal touches, with None for
+    IDs whose last journalled operation is a delete.
+    """
+    changes = {}
+    for record in read_journal():
+        if record.get('op') == 'add':
+            changes[record['expense']['id']] = record['expense']
+        elif record.get('op') == 'delete':
+            changes[record['id']] = None
+    return changes
+
+def iter_ledger():
+    """
+    Yield the live expenses in ID order straight from the snapshot and the
+    journal, without building the whole id -> expense map.
+    """
+    changes = journal_changes()
+    if os.path.exists(COLUMNAR_FILE):
+        with ColumnarSnapshot() as snapshot:
+            for row, expense_id in enumerate(snapshot.ids):
+                if expense_id in changes:
+                    expense = changes.pop(expense_id)
+                    if expense is not None:
+                        yield expense
+                else:
+                    yield snapshot.row(row)
+    else:
+        for expense in load_snapshot():
+            if expense['id'] in changes:
+                expense = changes.pop(expense['id'])
+                if expense is not None:
+                    yield expense
+            else:
+                yield expense
+    for expense_id in sorted(changes):
+        if changes[expense_id] is not None:
+            yield changes[expense_id]
+
+def load_expense_map():
+    """
+    Load the expenses keyed by ID: the snapshot plus a replay of the journal.
+    Replaying is idempotent, so a journal left behind by an interrupted
+    compaction is harmless.
+    """
+    expenses = {expense['id']: expense for expense in load_snapshot()}
+    for record in read_journal():
+        if record.get('op') == 'add':
+            expense = record['expense']
+            expenses[expense['id']] = expense
+        elif record.get('op') == 'delete':
+            expenses.pop(record['id'], None)
+    return expenses
+
+def load_expenses():
+    """
+    Load the list of expenses: the snapshot plus a replay of the journal.
+    """
+    return list(load_expense_map().values())
+
+def write_snapshot(expenses):
+    """
+    Atomically write the snapshot in the same layout as json.dump(indent=2)
+    and return the (id, offset, length, SOURCE_SNAPSHOT) slot of each record.
+    `expenses` may be any iterable.
+    """
+    slots = []
+    tmp_path = f"{EXPENSE_FILE}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(b'[')
+        for expense in expenses:
+            f.write(b',\n' if slots else b'\n')
+            body = json.dumps(expense, indent=2).replace('\n', '\n  ').encode('utf-8')
+            f.write(b'  ')
+            slots.append((expense['id'], f.tell(), len(body), SOURCE_SNAPSHOT))
+            f.write(body)
+        f.write(b'\n]' if slots else b']')
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, EXPENSE_FILE)
+    return slots
+
+def save_expenses(expenses, columnar=False):
+    """
+    Commit the full list of expenses as a new snapshot (JSON, or columnar
+    if `columnar` is set) and clear the journal.
+    Returns the offset slots of the new snapshot, or None if saving fails.
+    """
+    try:
+        slots = write_columnar(expenses) if columnar else write_snapshot(expenses)
+        # Until the journal is cleared, either snapshot plus the journal
+        # replays to the same ledger, so a crash in between is harmless
+        stale = EXPENSE_FILE if columnar else COLUMNAR_FILE
+        if os.path.exists(stale):
+            os.remove(stale)
+        # The snapshot already contains every journalled change
+        with open(JOURNAL_FILE, 'w'):
+            pass
+        return slots
     except Exception:
         print("❌ Error: Unable to save expenses")
-    
+        return None
+
+def read_offsets_version():
+    """
+    Return the store version the offset index is valid for, or None.
+    """
+    try:
+        with open(OFFSETS_FILE, 'rb') as f:
+            header = f.read(OFFSET_SLOT.size)
+    except FileNotFoundError:
+        return None
+    return OFFSET_SLOT.unpack(header)[0] if len(header) == OFFSET_SLOT.size else None
+
+def drop_offsets():
+    """
+    Delete the offset index so nothing trusts it until it is rewritten.
+    """
+    try:
+        os.remove(OFFSETS_FILE)
+    except FileNotFoundError:
+        pass
+
+def update_offsets(slots, version):
+    """
+    Overwrite the slots of the given (id, offset, length, source) entries in
+    place, then stamp the index with `version`. Only the affected bytes of
+    the file are touched.
+    """
+    with open(OFFSETS_FILE, 'r+b') as f:
+        for expense_id, offset, length, source in slots:
+            f.seek(expense_id * OFFSET_SLOT.size)
+            f.write(OFFSET_SLOT.pack(offset, length, source))
+        f.seek(0)
+        f.write(OFFSET_SLOT.pack(version, 0, SOURCE_NONE))
+        f.flush()
+        os.fsync(f.fileno())
+
+def rewrite_offsets(slots, version):
+    """
+    Replace the offset index with one holding just `slots`.
+    """
+    tmp_path = f"{OFFSETS_FILE}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(OFFSET_SLOT.pack(version, 0, SOURCE_NONE))
+        for expense_id, offset, length, source in slots:
+            f.seek(expense_id * OFFSET_SLOT.size)
+            f.write(OFFSET_SLOT.pack(offset, length, source))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, OFFSETS_FILE)
+
+def read_expense_at(expense_id):
+    """
+    Read a single expense through the offset index without loading the ledger.
+    Returns None if the ID has no live record; raises ValueError if the
+    index points at something that isn't that expense.
+    """
+    with open(OFFSETS_FILE, 'rb') as f:
+        f.seek(expense_id * OFFSET_SLOT.size)
+        slot = f.read(OFFSET_SLOT.size)
+    if len(slot) < OFFSET_SLOT.size:
+        return None
+    offset, length, source = OFFSET_SLOT.unpack(slot)
+    if source == SOURCE_NONE:
+        return None
+    if source == SOURCE_COLUMNAR:
+        with ColumnarSnapshot() as snapshot:
+            if offset >= len(snapshot) or snapshot.ids[offset] != expense_id:
+                raise ValueError(f"offset index out of step for ID {expense_id}")
+            return snapshot.row(offset)
+    with open(EXPENSE_FILE if source == SOURCE_SNAPSHOT else JOURNAL_FILE, 'rb') as f:
+        f.seek(offset)
+        record = json.loads(f.read(length))
+    expense = record if source == SOURCE_SNAPSHOT else record.get('expense', {})
+    if expense.get('id') != expense_id:
+        raise ValueError(f"offset index out of step for ID {expense_id}")
+    return normalize_expense(expense)
+
+def journal_size():
+    """
+    Return the size of the journal in bytes (0 if it doesn't exist).
+    """
+    try:
+        return os.path.getsize(JOURNAL_FILE)
+    except OSError:
+        return 0
+
+def store_stamp():
+    """
+    Return a fingerprint of the ledger files on disk.
+    The aggregate index is only trusted while this still matches.
+    """
+    path = COLUMNAR_FILE if os.path.exists(COLUMNAR_FILE) else EXPENSE_FILE
+    try:
+        snapshot = os.stat(path)
+        snapshot_stamp = [path, snapshot.st_size, snapshot.st_mtime_ns]
+    except OSError:
+        snapshot_stamp = None
+    return {'snapshot': snapshot_stamp, 'journal_size': journal_size()}
+
+def bucket_key(expense):
+    """
+    Return the (year, month, category) bucket an expense is aggregated under.
+    Expenses with an unreadable date land in year and month 0.
+    """
+    try:
+        year, month = (int(part) for part in expense['date'].split('-')[:2])
+    except (AttributeError, ValueError):
+        year, month = 0, 0
+    return year, month, expense['category']
+
+def day_ordinal(value):
+    """
+    Return the proleptic ordinal of a YYYY-MM-DD date string, or None.
+    """
+    try:
+        return date.fromisoformat(value).toordinal()
+    except (TypeError, ValueError):
+        return None
+
+class DateIndex:
+    """
+    Per-day totals in cents as a packed, sorted array of day ordinals with
+    prefix sums, so the total over any date range costs two bisects.
+    """
+
+    def __init__(self, days):
+        ordinals = sorted(
+            (day_ordinal(day), cents) for day, cents in days.items()
+            if day_ordinal(day) is not None
+        )
+        self.ordinals = array('i', (ordinal for ordinal, _ in ordinals))
+        # prefix[i] is the total of the first i days
+        self.prefix = array('q', [0])
+        for _, cents in ordinals:
+            self.prefix.append(self.prefix[-1] + cents)
+
+    def range_total(self, start=None, end=None):
+        """
+        Return the total spent between `start` and `end` (dates, inclusive).
+        Either bound may be None for an open-ended range.
+        """
+        lo = 0 if start is None else bisect_left(self.ordinals, start.toordinal())
+        hi = len(self.ordinals) if end is None else bisect_right(self.ordinals, end.toordinal())
+        return self.prefix[hi] - self.prefix[lo] if hi > lo else 0
+
+class AggregateIndex:
+    """
+    Running totals in integer cents keyed by (year, month, category) and by
+    day, with per-month, per-category and grand totals derived from them for
+    O(1) lookups. Totals are exact however many expenses they cover.
+    """
+
+    def __init__(self, buckets=None, days=None):
+        self.buckets = {}
+        self.days = dict(days or {})
+        self.by_month = {}
+        self.by_category = {}
+        self.total = 0
+        self._date_index = None
+        for key, amount in (buckets or {}).items():
+            self._bump(key, amount)
+
+    @classmethod
+    def from_expenses(cls, expenses):
+        """
+        Rebuild the index from the raw ledger.
+        """
+        index = cls()
+        for expense in expenses:
+            index.apply(expense)
+        return index
+
+    @classmethod
+    def from_columns(cls, snapshot):
+        """
+        Rebuild the index from a columnar snapshot, one entry per
+        (day, category) group instead of one per expense.
+        """
+        index = cls()
+        for (ordinal, code), cents in snapshot.group_totals().items():
+            if not ordinal:
+                continue
+            category = snapshot.categories[code]
+            day = date.fromordinal(ordinal)
+            index._bump((day.year, day.month, category), cents)
+            day = day.isoformat()
+            index.days[day] = index.days.get(day, 0) + cents
+        # Unreadable dates are rare; bucket them exactly as apply() does
+        for row in snapshot.odd_dates:
+            index.apply(snapshot.row(row))
+        return index
+
+    def _bump(self, key, amount):
+        year, month, category = key
+        self.buckets[key] = self.buckets.get(key, 0) + amount
+        self.by_month[(year, month)] = self.by_month.get((year, month), 0) + amount
+        self.by_category[category] = self.by_category.get(category, 0) + amount
+        self.total += amount
+
+    def apply(self, expense, sign=1):
+        """
+        Add (sign=1) or remove (sign=-1) an expense from the totals.
+        """
+        amount = sign * expense['cents']
+        self._bump(bucket_key(expense), amount)
+        if day_ordinal(expense['date']) is not None:
+            self.days[expense['date']] = self.days.get(expense['date'], 0) + amount
+            self._date_index = None
+
+    @property
+    def date_index(self):
+        if self._date_index is None:
+            self._date_index = DateIndex(self.days)
+        return self._date_index
+
+    def month_total(self, year, month):
+        return self.by_month.get((year, month), 0)
+
+    def range_total(self, start=None, end=None):
+        return self.date_index.range_total(start, end)
+
+    def category_total(self, category):
+        return self.by_category.get(category, 0)
+
+def load_index():
+    """
+    Load the aggregate index from disk.
+    Returns None if it is missing, invalid or out of step with the ledger.
+    """
+    try:
+        with open(INDEX_FILE, 'r') as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if data.get('format') != INDEX_FORMAT or data.get('stamp') != store_stamp():
+        return None
+    return AggregateIndex(
+        {(year, month, category): amount for year, month, category, amount in data['buckets']},
+        dict(data['days']),
+    )
+
+def read_store_header():
+    """
+    Return the (version, next_id) pair from the index header.
+    Every committed write to the expense or budget store bumps the version;
+    next_id is the persisted ID sequence (None if it was never saved).
+    """
+    try:
+        with open(INDEX_FILE, 'r') as f:
+            header = json.load(f)
+        return header.get('version', 0), header.get('next_id')
+    except (FileNotFoundError, json.JSONDecodeError, AttributeError):
+        return 0, None
+
+def read_index_format():
+    """
+    Return the format number of the saved index, or None if there is none.
+    """
+    try:
+        with open(INDEX_FILE, 'r') as f:
+            return json.load(f).get('format')
+    except (FileNotFoundError, json.JSONDecodeError, AttributeError):
+        return None
+
+def save_index(index, version, next_id):
+    """
+    Save the aggregate index, the store version counter, the ID sequence
+    and the current ledger fingerprint.
+    """
+    atomic_write_json(INDEX_FILE, {
+        'format': INDEX_FORMAT,
+        'version': version,
+        'next_id': next_id,
+        'stamp': store_stamp(),
+        'buckets': [[*key, amount] for key, amount in index.buckets.items()],
+        'days': list(index.days.items()),
+    }, indent=None)
+
+def rebuild_index(session=None):
+    """
+    Rebuild the aggregate index from the raw ledger.
+    """
+    (session or ExpenseSession()).rebuild_index()
+    print("🔁 Expense summary index rebuilt successfully")
+
+def columnar_index():
+    """
+    Build the aggregate index from the columnar snapshot plus the journal.
+    Returns the index and the highest expense ID seen.
+    """
+    with ColumnarSnapshot() as snapshot:
+        index = AggregateIndex.from_columns(snapshot)
+        max_id = snapshot.ids[-1] if len(snapshot) else 0
+        for expense_id, expense in journal_changes().items():
+            row = snapshot.find(expense_id)
+            if row is not None:
+                index.apply(snapshot.row(row), sign=-1)
+            if expense is not None:
+                index.apply(expense)
+            max_id = max(max_id, expense_id)
+    return index, max_id
+
+def compact_journal(session=None, fmt=None):
+    """
+    Fold the journal into the snapshot with an atomic rename-based commit
+    (or checkpoint the write-ahead log of an SQLite store). `fmt` switches
+    the snapshot between 'json' and 'columnar'.
+    """
+    (session or ExpenseSession()).compact(fmt)
+    print("🗜️ Expense store compacted successfully")
+
 def load_budgets():
     """
     Load the list of monthly budgets from the JSON file.
@@ -38,9 +780,13 @@ def load_budgets():
     """
     try:
         with open(BUDGET_FILE, 'r') as bud_f:
-            return json.load(bud_f)
+            budgets = json.load(bud_f)
     except (FileNotFoundError, json.JSONDecodeError):
         return []
+    # Budgets saved before amounts were kept in cents
+    for budget in budgets:
+        normalize_expense(budget)
+    return budgets
     
 def save_budget(budgets):
     """
@@ -48,18 +794,590 @@ def save_budget(budgets):
     Prints an error if saving fails.
     """
     try:
-        with open(BUDGET_FILE,'w') as bud_file:
-            json.dump(budgets,bud_file,indent=2)
+        atomic_write_json(BUDGET_FILE, budgets)
     except Exception:
         print("❌ Error: Unable to save budget")
             
-def create_id():
+class ExpenseSession:
+    """
+    Holds the expense and budget stores for a single CLI invocation.
+    Each store is parsed at most once, on first use, and ID allocation,
+    monthly totals and budget lookups are then served from memory.
+    Expenses are kept in a dict keyed by ID, so lookups and deletes are O(1);
+    a single lookup before the ledger is loaded goes through the on-disk
+    offset index instead of parsing the whole store.
+    """
+
+    def __init__(self):
+        self._by_id = None
+        self._budgets = None
+        self._index = None
+        self._version, self._next_id = read_store_header()
+        self._depth = 0
+        # Set by `serve`: commits only touch memory until flush()
+        self.defer_commits = False
+        self._pending = []
+        self._dirty = False
+
+    def iter_expenses(self, start=None, end=None, category=None, limit=None, offset=0):
+        """
+        Yield expenses in ID order, optionally filtered by date range and
+        category, skipping `offset` matches and stopping after `limit`.
+        """
+        # Without a loaded ledger, stream it instead of building the id map
+        expenses = self.by_id.values() if self._by_id is not None else iter_ledger()
+        matches = (
+            expense for expense in expenses
+            if (not start or expense['date'] >= start.isoformat())
+            and (not end or expense['date'] <= end.isoformat())
+            and (category is None or expense['category'] == category)
+        )
+        stop = None if limit is None else offset + limit
+        yield from islice(matches, offset, stop)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run the reads and writes of one command under the store's advisory
+        lock. If another process has committed since this session's caches
+        were loaded (the version counter moved on), they are reloaded first,
+        so IDs and budget checks always see the latest state.
+        Each JSON write commits on its own, so there is nothing to roll back;
+        the journal is compacted once at the end if it has grown too large.
+        """
+        if self._depth:
+            yield
+            return
+        with locked(LOCK_FILE):
+            self._depth += 1
+            try:
+                version, next_id = read_store_header()
+                if version != self._version:
+                    self._by_id = self._budgets = self._index = None
+                    self._version, self._next_id = version, next_id
+                yield
+                self.maybe_compact()
+            finally:
+                self._depth -= 1
+
+    def _commit(self, slots=(), rewrite=False):
+        """
+        Bump the version counter and save it with the index and ID sequence.
+        `slots` are the offset index entries this change moved; the offset
+        index is only patched if it was in step with the previous version,
+        and is replaced outright when `rewrite` is set.
+        """
+        if self.defer_commits and not rewrite:
+            self._pending.extend(slots)
+            self._dirty = True
+            return
+        slots = list(slots) if rewrite else self._pending + list(slots)
+        self._pending, self._dirty = [], False
+        in_step = read_offsets_version() == self._version
+        self._version += 1
+        if rewrite:
+            rewrite_offsets(slots, self._version)
+        elif in_step:
+            update_offsets(slots, self._version)
+        save_index(self.index, self._version, self._next_id)
+
+    @property
+    def by_id(self):
+        if self._by_id is None:
+            self._by_id = load_expense_map()
+        return self._by_id
+
+    @property
+    def expenses(self):
+        return list(self.by_id.values())
+
+    @property
+    def index(self):
+        """
+        The aggregate index, rebuilt from the ledger if it is missing or stale.
+        """
+        if self._index is None:
+            self._index = load_index()
+            if self._index is None:
+                # The store changed behind our back, so the offsets can't be trusted either
+                drop_offsets()
+                legacy = read_index_format() != INDEX_FORMAT and os.path.exists(EXPENSE_FILE)
+                self.rebuild_index()
+                if legacy:
+                    # Written before amounts were kept in cents: rewrite it once
+                    self.compact()
+        return self._index
+
+    def rebuild_index(self):
+        """
+        Rebuild the aggregate index from the raw ledger and save it.
+        """
+        with self.transaction():
+            if self._by_id is None and os.path.exists(COLUMNAR_FILE):
+                self._index, max_id = columnar_index()
+            else:
+                self._index = AggregateIndex.from_expenses(self.by_id.values())
+                max_id = max(self.by_id, default=0)
+            # Never move the sequence backwards, but skip past any IDs the
+            # ledger gained without it (e.g. files from an older version)
+            self._next_id = max(self._next_id or 1, max_id + 1)
+            self._commit()
+
+    @property
+    def budgets(self):
+        """
+        Budgets keyed by (year, month); year is None for a budget that
+        applies to that month of every year.
+        """
+        if self._budgets is None:
+            self._budgets = {(budget.get('year'), budget['month']): budget for budget in load_budgets()}
+        return self._budgets
+
+    def compact(self, fmt=None):
+        """
+        Fold the journal back into the snapshot and rewrite the offset index.
+        `fmt` ('json' or 'columnar') switches the snapshot format; by default
+        the current one is kept.
+        """
+        with self.transaction():
+            # Load the index first so the new fingerprint is saved with it
+            self.index
+            # A crash mid-compaction must not leave offsets into the old files
+            drop_offsets()
+            columnar = os.path.exists(COLUMNAR_FILE) if fmt is None else fmt == 'columnar'
+            expenses = self.by_id.values() if self._by_id is not None else iter_ledger()
+            slots = save_expenses(expenses, columnar)
+            if slots is None:
+                return
+            self._commit(slots, rewrite=True)
+
+    def next_id(self):
+        """
+        Return the next ID from the persisted sequence in O(1).
+        IDs of deleted expenses are never handed out again.
+        """
+        # A missing or stale index is rebuilt first, which also seeds the sequence
+        self.index
+        if self._next_id is None:
+            self.rebuild_index()
+        return self._next_id
+
+    def reserve_ids(self, count):
+        """
+        Reserve `count` consecutive IDs in one commit and return the first.
+        """
+        with self.transaction():
+            first_id = self.next_id()
+            self._next_id = first_id + count
+            self._commit()
+        return first_id
+
+    def get(self, expense_id):
+        """
+        Return the expense with `expense_id`, or None.
+        """
+        # Deferred commits have not patched the offset index yet
+        if self._by_id is None and not self._dirty:
+            if read_offsets_version() != self._version:
+                # Compaction loads the ledger anyway and leaves a fresh offset index
+                self.compact()
+            else:
+                try:
+                    return read_expense_at(expense_id)
+                except (OSError, ValueError):
+                    pass
+        return self.by_id.get(expense_id)
+
+    def total(self):
+        return self.index.total
+
+    def category_total(self, category):
+        return self.index.category_total(category)
+
+    def month_total(self, year, month):
+        """
+        Return the total expenses recorded for `month` of `year`.
+        """
+        return self.index.month_total(year, month)
+
+    def range_total(self, start=None, end=None):
+        """
+        Return the total expenses recorded between two dates (inclusive).
+        """
+        return self.index.range_total(start, end)
+
+    def budget_for(self, year, month):
+        """
+        Return the budget record ('cents' and optional 'warn'/'hard'
+        percentages) for `month` of `year`, or None if none is set.
+        Budgets saved without a year apply to that month of every year.
+        """
+        return self.budgets.get((year, month)) or self.budgets.get((None, month))
+
+    def set_budget(self, year, month, cents, warn=None, hard=None):
+        """
+        Set the budget for `month` of `year`, in cents, and optionally its
+        warn/hard thresholds (thresholds left as None keep their value).
+        Returns True if an existing budget was updated.
+        """
+        with self.transaction():
+            existed = (year, month) in self.budgets
+            budget = self.budgets.setdefault((year, month), {"year": year, "month": month})
+            budget['cents'] = cents
+            if warn is not None:
+                budget['warn'] = warn
+            if hard is not None:
+                budget['hard'] = hard
+            save_budget(list(self.budgets.values()))
+            self._commit()
+            return existed
+
+    def add(self, expense):
+        """
+        Journal a new expense and keep the in-memory list and index in step.
+        """
+        with self.transaction():
+            # Load the index before the journal moves on, or it would look stale
+            index = self.index
+            self._next_id = max(self.next_id(), expense['id'] + 1)
+            [(offset, length)] = append_journal({'op': 'add', 'expense': expense})
+            index.apply(expense)
+            self._commit([(expense['id'], offset, length, SOURCE_JOURNAL)])
+            if self._by_id is not None:
+                self._by_id[expense['id']] = expense
+
+    def add_many(self, expenses):
+        """
+        Journal a batch of expenses with a single write and index update.
+        """
+        with self.transaction():
+            index = self.index
+            self._next_id = max([self.next_id()] + [expense['id'] + 1 for expense in expenses])
+            positions = append_journal(*({'op': 'add', 'expense': expense} for expense in expenses))
+            for expense in expenses:
+                index.apply(expense)
+            self._commit([
+                (expense['id'], offset, length, SOURCE_JOURNAL)
+                for expense, (offset, length) in zip(expenses, positions)
+            ])
+            if self._by_id is not None:
+                self._by_id.update((expense['id'], expense) for expense in expenses)
+
+    def remove(self, expense):
+        """
+        Journal the deletion of an expense and drop it from memory and the index.
+        """
+        with self.transaction():
+            index = self.index
+            append_journal({'op': 'delete', 'id': expense['id']})
+            index.apply(expense, sign=-1)
+            self._commit([(expense['id'], 0, 0, SOURCE_NONE)])
+            if self._by_id is not None:
+                self._by_id.pop(expense['id'], None)
+
+    def flush(self):
+        """
+        Write out the index and offsets of commits deferred by `serve`.
+        The journal itself is always appended immediately.
+        """
+        if self._dirty:
+            deferring, self.defer_commits = self.defer_commits, False
+            try:
+                self._commit()
+            finally:
+                self.defer_commits = deferring
+
+    def maybe_compact(self):
+        """
+        Compact the journal once it has grown past JOURNAL_COMPACT_BYTES.
+        """
+        if journal_size() > JOURNAL_COMPACT_BYTES:
+            self.compact()
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS expenses (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date TEXT NOT NULL,
+    description TEXT NOT NULL,
+    cents INTEGER NOT NULL,
+    category TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS expenses_by_date ON expenses (date, cents);
+CREATE INDEX IF NOT EXISTS expenses_by_category ON expenses (category, cents);
+CREATE TABLE IF NOT EXISTS budgets (
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    cents INTEGER NOT NULL,
+    warn REAL,
+    hard REAL,
+    PRIMARY KEY (year, month)
+);
+"""
+
+# Moves databases created with REAL amounts over to integer cents,
+# keeping the AUTOINCREMENT sequence so deleted IDs stay retired
+SQLITE_CENTS_MIGRATION = """
+DROP INDEX IF EXISTS expenses_by_date;
+DROP INDEX IF EXISTS expenses_by_category;
+ALTER TABLE expenses RENAME TO legacy_expenses;
+ALTER TABLE budgets RENAME TO legacy_budgets;
+""" + SQLITE_SCHEMA + """
+INSERT INTO expenses (id, date, description, cents, category)
+    SELECT id, date, description, CAST(ROUND(amount * 100) AS INTEGER), category FROM legacy_expenses;
+INSERT INTO budgets (year, month, cents)
+    SELECT year, month, CAST(ROUND(amount * 100) AS INTEGER) FROM legacy_budgets;
+DELETE FROM sqlite_sequence WHERE name = 'expenses';
+UPDATE sqlite_sequence SET name = 'expenses' WHERE name = 'legacy_expenses';
+DROP TABLE legacy_expenses;
+DROP TABLE legacy_budgets;
+"""
+
+# Year stored for budgets that apply to a month of every year
+ANY_YEAR = 0
+
+class SqliteExpenseSession:
+    """
+    Expense and budget stores backed by an SQLite database in WAL mode.
+    Every command runs as a single statement or an IMMEDIATE transaction,
+    so several processes can write at once without losing updates.
+    """
+
+    def __init__(self, path):
+        import sqlite3
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self._in_transaction = False
+        # `serve` defers commits by holding one transaction open
+        self.defer_commits = False
+        if self._has_legacy_amounts():
+            self._migrate_to_cents()
+        self.conn.executescript(SQLITE_SCHEMA)
+        if not self._has_thresholds():
+            with self.transaction():
+                if not self._has_thresholds():
+                    self.conn.execute("ALTER TABLE budgets ADD COLUMN warn REAL")
+                    self.conn.execute("ALTER TABLE budgets ADD COLUMN hard REAL")
+
+    def _has_thresholds(self):
+        return any(row[1] == 'warn' for row in self.conn.execute("PRAGMA table_info(budgets)"))
+
+    def _has_legacy_amounts(self):
+        return any(row[1] == 'amount' for row in self.conn.execute("PRAGMA table_info(expenses)"))
+
+    def _migrate_to_cents(self):
+        with self.transaction():
+            # Another process may have migrated while we waited for the lock
+            if self._has_legacy_amounts():
+                for statement in SQLITE_CENTS_MIGRATION.split(";"):
+                    if statement.strip():
+                        self.conn.execute(statement)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run the enclosed reads and writes as one IMMEDIATE transaction.
+        """
+        if self._in_transaction:
+            yield
+            return
+        self.conn.execute("BEGIN IMMEDIATE")
+        self._in_transaction = True
+        try:
+            yield
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        else:
+            self.conn.execute("COMMIT")
+        finally:
+            self._in_transaction = False
+
+    def flush(self):
+        pass
+
+    def _scalar(self, sql, params=()):
+        return self.conn.execute(sql, params).fetchone()[0]
+
+    @property
+    def expenses(self):
+        rows = self.conn.execute(
+            "SELECT id, date, description, cents, category FROM expenses ORDER BY id"
+        )
+        return [dict(row) for row in rows]
+
+    def iter_expenses(self, start=None, end=None, category=None, limit=None, offset=0):
+        """
+        Stream expenses in ID order, BATCH_SIZE rows at a time, optionally
+        filtered by date range and category and paged with limit/offset.
+        """
+        cursor = self.conn.execute(
+            "SELECT id, date, description, cents, category FROM expenses "
+            "WHERE (:start IS NULL OR date >= :start) AND (:end IS NULL OR date <= :end) "
+            "AND (:category IS NULL OR category = :category) ORDER BY id "
+            "LIMIT :limit OFFSET :offset",
+            {
+                'start': start.isoformat() if start else None,
+                'end': end.isoformat() if end else None,
+                'category': category,
+                'limit': -1 if limit is None else limit,
+                'offset': offset,
+            },
+        )
+        while rows := cursor.fetchmany(BATCH_SIZE):
+            for row in rows:
+                yield dict(row)
+
+    def rebuild_index(self):
+        self.conn.execute("REINDEX expenses")
+
+    def compact(self, fmt=None):
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def next_id(self):
+        """
+        Return the next ID from the AUTOINCREMENT sequence.
+        IDs of deleted expenses are never handed out again.
+        """
+        row = self.conn.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = 'expenses'"
+        ).fetchone()
+        return (row[0] if row else 0) + 1
+
+    def reserve_ids(self, count):
+        """
+        Advance the AUTOINCREMENT sequence by `count` and return the first ID.
+        """
+        with self.transaction():
+            first_id = self.next_id()
+            if self.conn.execute(
+                "UPDATE sqlite_sequence SET seq = ? WHERE name = 'expenses'",
+                (first_id + count - 1,),
+            ).rowcount == 0:
+                self.conn.execute(
+                    "INSERT INTO sqlite_sequence (name, seq) VALUES ('expenses', ?)",
+                    (first_id + count - 1,),
+                )
+        return first_id
+
+    def get(self, expense_id):
+        row = self.conn.execute(
+            "SELECT id, date, description, cents, category FROM expenses WHERE id = ?",
+            (expense_id,),
+        ).fetchone()
+        return dict(row) if row else None
+
+    def add(self, expense):
+        self.conn.execute(
+            "INSERT INTO expenses (id, date, description, cents, category) "
+            "VALUES (:id, :date, :description, :cents, :category)",
+            expense,
+        )
+
+    def add_many(self, expenses):
+        with self.transaction():
+            self.conn.executemany(
+                "INSERT INTO expenses (id, date, description, cents, category) "
+                "VALUES (:id, :date, :description, :cents, :category)",
+                expenses,
+            )
+
+    def remove(self, expense):
+        self.conn.execute("DELETE FROM expenses WHERE id = ?", (expense['id'],))
+
+    def total(self):
+        return self._scalar("SELECT COALESCE(SUM(cents), 0) FROM expenses")
+
+    def category_total(self, category):
+        return self._scalar(
+            "SELECT COALESCE(SUM(cents), 0) FROM expenses WHERE category = ?",
+            (category,),
+        )
+
+    def month_total(self, year, month):
+        start = date(year, month, 1)
+        end = date(year + month // 12, month % 12 + 1, 1)
+        return self._scalar(
+            "SELECT COALESCE(SUM(cents), 0) FROM expenses WHERE date >= ? AND date < ?",
+            (start.isoformat(), end.isoformat()),
+        )
+
+    def range_total(self, start=None, end=None):
+        return self._scalar(
+            "SELECT COALESCE(SUM(cents), 0) FROM expenses "
+            "WHERE (:start IS NULL OR date >= :start) AND (:end IS NULL OR date <= :end)",
+            {
+                'start': start.isoformat() if start else None,
+                'end': end.isoformat() if end else None,
+            },
+        )
+
+    def budget_for(self, year, month):
+        row = self.conn.execute(
+            "SELECT cents, warn, hard FROM budgets WHERE month = ? AND year IN (?, ?) "
+            "ORDER BY year DESC LIMIT 1",
+            (month, year, ANY_YEAR),
+        ).fetchone()
+        return {key: row[key] for key in row.keys() if row[key] is not None} if row else None
+
+    def set_budget(self, year, month, cents, warn=None, hard=None):
+        with self.transaction():
+            existed = self.conn.execute(
+                "SELECT 1 FROM budgets WHERE year = ? AND month = ?", (year, month)
+            ).fetchone() is not None
+            self.conn.execute(
+                "INSERT INTO budgets (year, month, cents, warn, hard) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (year, month) DO UPDATE SET cents = excluded.cents, "
+                "warn = COALESCE(excluded.warn, warn), hard = COALESCE(excluded.hard, hard)",
+                (year, month, cents, warn, hard),
+            )
+        return existed
+
+def open_session(db=None):
+    """
+    Open the SQLite store at `db`, or the JSON files when no database is given.
+    """
+    if db:
+        return SqliteExpenseSession(db)
+    return ExpenseSession()
+
+def migrate_to_sqlite(db, session=None):
+    """
+    Copy the expenses and budgets from the JSON files into an SQLite database.
+    Existing rows with the same ID or (year, month) are replaced.
+    An open JSON session (e.g. the one `serve` holds, with its lock and any
+    deferred commits) is read from memory instead of opening a second one.
+    """
+    source = session if isinstance(session, ExpenseSession) else ExpenseSession()
+    target = SqliteExpenseSession(db)
+    expenses = source.expenses
+    with target.transaction():
+        target.conn.executemany(
+            "INSERT OR REPLACE INTO expenses (id, date, description, cents, category) "
+            "VALUES (:id, :date, :description, :cents, :category)",
+            expenses,
+        )
+        target.conn.executemany(
+            "INSERT OR REPLACE INTO budgets (year, month, cents, warn, hard) VALUES (?, ?, ?, ?, ?)",
+            [
+                (budget.get('year') or ANY_YEAR, budget['month'], budget['cents'],
+                 budget.get('warn'), budget.get('hard'))
+                for budget in source.budgets.values()
+            ],
+        )
+        # Carry the JSON ID sequence over so deleted IDs stay retired
+        if target.next_id() < source.next_id():
+            target.reserve_ids(source.next_id() - target.next_id())
+    print(f"✅ Migrated {len(expenses)} expenses and {len(source.budgets)} budgets to {db}")
+
+def create_id(session=None):
     """
     Generate a unique ID for a new expense.
     Returns the next available integer ID.
     """
-    expenses = load_expenses()
-    return max([expense['id'] for expense in expenses], default=0) + 1
+    if session is None:
+        session = ExpenseSession()
+    return session.next_id()
 
 def get_time_stamp():
     """
@@ -67,72 +1385,115 @@ def get_time_stamp():
     """
     return datetime.now().strftime("%Y-%m-%d")
 
-def add_to_cart(desc, amount, category):
+def add_to_cart(desc, amount, category, session=None):
     """
     Add a new expense to the list after validating input and checking budget.
+    `amount` may be a string, Decimal or number; it is stored as cents.
     """
     if not desc.strip():
         print("❌ Error: Description cannot be empty.")
         return
-    if amount <= 0:
+    try:
+        cents = to_cents(amount)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        return
+    if cents <= 0:
         print("❌ Error: Amount must be a positive number.")
         return
 
-    expenses = load_expenses() 
-            
+    if session is None:
+        session = ExpenseSession()
+
     expense = {
-        'id': create_id(),
+        'id': None,
         'date': get_time_stamp(),
         "description": desc.strip(),
-        "amount": round(amount, 2),
+        "cents": cents,
         'category': category,
     }
     
-    # Extract month from the date
-    month = int(expense['date'].split('-')[1])   
-    budgets = load_budgets()
-    monthly_budget = 0
-    
-    # Get current total expenses for the month
-    current_expense = get_filter_summary(month)
-    
-    # Find the budget for the current month
-    for budget in budgets:
-        if (budget['month'] == month):
-            monthly_budget = budget['amount']
-    
-    # Check if adding this expense exceeds the monthly budget
-    if (expense['amount'] + current_expense) > monthly_budget:
-        print("❌ Error: You have exceeded your monthly budget.")
-        return
-    
-    expenses.append(expense)
-    save_expenses(expenses)
+    # Extract year and month from the date
+    year, month = (int(part) for part in expense['date'].split('-')[:2])
+
+    with session.transaction():
+        expense['id'] = create_id(session)
+
+        # The month's running total and budget are both O(1) lookups
+        current_expense = get_filter_summary(month, year, session)
+        monthly_budget = session.budget_for(year, month)
+
+        # Check if adding this expense exceeds the monthly budget
+        state = budget_state(expense['cents'] + current_expense, monthly_budget)
+        if state == 'over':
+            print("❌ Error: You have exceeded your monthly budget.")
+            return
+
+        try:
+            session.add(expense)
+        except OSError:
+            print("❌ Error: Unable to save expenses")
+            return
     print(f"✅ Expense added successfully (ID: {expense['id']})")
+    if state == 'warn':
+        warn_budget(year, month, expense['cents'] + current_expense, monthly_budget)
 
-def remove_from_cart(id):
+def remove_from_cart(id, session=None):
     """
     Remove an expense by its ID.
     Prints a message if the expense is not found.
     """
-    expenses = load_expenses()
-    found = False
-    for expense in expenses:
-        if expense['id'] == int(id):
-            found = True
-            expenses.remove(expense)
-            save_expenses(expenses)
-            print(f"🗑️ Expense deleted successfully (ID: {id})")
-            break
-    if not found:
-        print(f"❌ Error: Expense with ID {id} not found.")
-
-def set_budget(month, amount):
-    """
-    Set or update the budget for a specific month.
+    if session is None:
+        session = ExpenseSession()
+    with session.transaction():
+        expense = session.get(int(id))
+        if expense is None:
+            print(f"❌ Error: Expense with ID {id} not found.")
+            return
+        try:
+            session.remove(expense)
+        except OSError:
+            print("❌ Error: Unable to save expenses")
+            return
+    print(f"🗑️ Expense deleted successfully (ID: {id})")
+
+def budget_state(spent, budget):
+    """
+    Classify `spent` cents against a budget record: 'over' past its hard
+    threshold (or with no budget at all), 'warn' at or past its soft
+    threshold, 'ok' otherwise.
+    """
+    if budget is None:
+        return 'over' if spent > 0 else 'ok'
+    if spent * 100 > budget['cents'] * budget.get('hard', BUDGET_HARD_PERCENT):
+        return 'over'
+    if spent * 100 >= budget['cents'] * budget.get('warn', BUDGET_WARN_PERCENT):
+        return 'warn'
+    return 'ok'
+
+def used_percent(spent, budget):
+    return round(spent * 100 / budget['cents']) if budget and budget['cents'] else 0
+
+def warn_budget(year, month, spent, budget):
+    """
+    Print the soft-threshold warning for a month.
+    """
+    print(f"⚠️ Warning: {used_percent(spent, budget)}% of the {year}-{month:02d} budget is used "
+          f"($ {from_cents(spent)} of $ {from_cents(budget['cents'])})")
+
+def set_budget(month, amount, year=None, session=None, warn=None, hard=None):
+    """
+    Set or update the budget for a specific month of a year
+    (the current year by default), with optional soft (`warn`) and hard
+    thresholds in percent of the budget.
     Validates input and updates or adds the budget entry.
     """
-    if amount <= 0:
+    try:
+        cents = to_cents(amount)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        return
+    if cents <= 0:
         print("❌ Error: Amount must be a positive number.")
         return
     
@@ -140,119 +1501,404 @@ def set_budget(month, amount):
         print("❌ Error: Month must be between 1 and 12.")
         return
     
-    budgets = load_budgets()
+    if warn is not None and warn <= 0 or hard is not None and hard <= 0:
+        print("❌ Error: Thresholds must be positive percentages.")
+        return
+    if warn is not None and hard is not None and warn > hard:
+        print("❌ Error: The warning threshold cannot be above the hard threshold.")
+        return
+
     month = int(month)
+    year = int(year) if year is not None else datetime.now().year
 
-    # Check if budget for this month already exists
-    for budget in budgets:
-        if budget['month'] == month:
-            budget['amount'] = amount
-            save_budget(budgets)
-            print(f"✅ Budget updated successfully for month {month}")
-            return
+    if (session or ExpenseSession()).set_budget(year, month, cents, warn, hard):
+        print(f"✅ Budget updated successfully for {year}-{month:02d}")
+    else:
+        print(f"✅ Budget set successfully for {year}-{month:02d}")
+
+def budget_status(year=None, session=None, fmt='table'):
+    """
+    Show spending against the budget of every budgeted month of `year`
+    (the current year by default). Each month costs one budget lookup and
+    one running-total lookup.
+    """
+    session = session or ExpenseSession()
+    year = year or datetime.now().year
+    rows = []
+    for month in range(1, 13):
+        budget = session.budget_for(year, month)
+        if budget is None:
+            continue
+        spent = session.month_total(year, month)
+        rows.append({
+            'month': f"{year}-{month:02d}",
+            'budget': from_cents(budget['cents']),
+            'spent': from_cents(spent),
+            'remaining': from_cents(budget['cents'] - spent),
+            'used': used_percent(spent, budget),
+            'status': budget_state(spent, budget),
+        })
+    if not render_rows(rows, BUDGET_COLUMNS, fmt) and fmt == 'table':
+        print(f"ℹ️ No budgets set for {year}.")
 
-    # If not found, add a new entry
-    budgets.append({
-        "month": month,
-        "amount": amount
-    })
-    save_budget(budgets)
-    print(f"✅ Budget set successfully for month {month}")
+def fit(text, width):
+    """
+    Center `text` in `width` columns, truncating it with an ellipsis if needed.
+    """
+    if len(text) > width:
+        text = text[:width - 1] + "…"
+    return text.center(width)
 
-def get_list():
+def render_rows(rows, columns, fmt='table', page_size=None, out=None):
     """
-    Display all recorded expenses in a formatted table.
+    Write rows to `out` as they are produced instead of buffering the whole
+    listing. Tables use the fixed column widths and repeat their header every
+    `page_size` rows; jsonl and tsv skip table layout entirely.
+    Returns the number of rows written.
     """
-    expenses = load_expenses()
-    if not expenses:
+    out = out or sys.stdout
+    count = 0
+    if fmt == 'jsonl':
+        for row in rows:
+            # Two-place Decimals print exactly as JSON numbers via float
+            out.write(json.dumps(row, default=float) + "\n")
+            count += 1
+        return count
+    if fmt == 'tsv':
+        out.write("\t".join(key for _, key, _, _ in columns) + "\n")
+        for row in rows:
+            values = (str(row[key]).replace("\t", " ").replace("\n", " ") for _, key, _, _ in columns)
+            out.write("\t".join(values) + "\n")
+            count += 1
+        return count
+
+    border = "+" + "+".join("-" * (width + 2) for _, _, width, _ in columns) + "+\n"
+    header = "| " + " | ".join(fit(title, width) for title, _, width, _ in columns) + " |\n"
+    for row in rows:
+        if page_size and count and count % page_size == 0:
+            out.flush()
+            out.write("\n")
+        if count == 0 or (page_size and count % page_size == 0):
+            out.write(border + header + border)
+        out.write("| " + " | ".join(fit(show(row[key]), width) for _, key, width, show in columns) + " |\n")
+        out.write(border)
+        count += 1
+    out.flush()
+    return count
+
+def get_list(session=None, limit=None, offset=0, page_size=None, fmt='table'):
+    """
+    Display recorded expenses, streaming rows as they are read from storage.
+    """
+    expenses = (session or ExpenseSession()).iter_expenses(limit=limit, offset=offset)
+    rows = map(public_expense, expenses)
+    if not render_rows(rows, LIST_COLUMNS, fmt, page_size) and fmt == 'table':
         print("ℹ️ No expenses recorded yet.")
-        return
 
-    table = PrettyTable()
-    table.field_names = ["ID", "Date", "Description", "Amount", "Category"]
-    for expense in expenses:
-        table.add_row([
-            expense['id'],
-            expense['date'],
-            expense['description'],
-            f"$ {float(expense['amount']):.2f}",
-            expense['category']
-        ], divider=True)
-    print(table)
+def open_text(filename, mode, compress=None):
+    """
+    Open a text file for CSV/JSONL I/O, through gzip when `compress` is set
+    or, if it is None, when the filename ends in .gz.
+    """
+    if compress is None:
+        compress = filename.endswith('.gz')
+    if compress:
+        import gzip
+        return gzip.open(filename, mode + 't', newline='', encoding='utf-8')
+    return open(filename, mode, newline='', encoding='utf-8')
 
-def create_expenses_csv(filename='Expenses_Summary.csv'):
+def create_expenses_csv(filename='Expenses_Summary.csv', session=None,
+                        start=None, end=None, category=None, compress=None):
     """
-    Export all expenses to a CSV file.
+    Export expenses to a CSV file, optionally filtered and gzip-compressed.
+    Rows are streamed from storage and written BATCH_SIZE at a time.
     """
-    expenses = load_expenses()
+    import csv
+    expenses = map(public_expense, (session or ExpenseSession()).iter_expenses(start, end, category))
+    first = next(expenses, None)
 
-    if not expenses:
+    if first is None:
         print("ℹ️ No expenses recorded yet.")
         return
 
     try:
-        with open(filename, mode='w', newline='', encoding='utf-8') as file:
-            writer = csv.DictWriter(file, fieldnames=["id", "date", "description", "amount", "category"])
+        count = 1
+        with open_text(filename, 'w', compress) as file:
+            writer = csv.DictWriter(file, fieldnames=CSV_FIELDS)
             writer.writeheader()
-            writer.writerows(expenses)
-        print(f"✅ Expenses exported successfully to {filename}")
+            writer.writerow(first)
+            while batch := list(islice(expenses, BATCH_SIZE)):
+                writer.writerows(batch)
+                count += len(batch)
+        print(f"✅ {count} expenses exported successfully to {filename}")
     except Exception as e:
         print(f"❌ Failed to export CSV: {e}")
+
+def read_import_rows(filename, fmt=None):
+    """
+    Yield (line number, row dict) pairs from a CSV or JSON-lines file.
+    The format is taken from the file extension unless `fmt` is given.
+    """
+    import csv
+    if fmt is None:
+        name = filename[:-3] if filename.endswith('.gz') else filename
+        fmt = 'jsonl' if name.endswith(('.jsonl', '.json')) else 'csv'
+    with open_text(filename, 'r') as file:
+        if fmt == 'csv':
+            # Line 1 is the header
+            yield from enumerate(csv.DictReader(file), start=2)
+            return
+        for line_no, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_no, json.loads(line)
+            except json.JSONDecodeError:
+                yield line_no, None
+
+def parse_import_row(row):
+    """
+    Validate an imported row and turn it into an expense without an ID.
+    Raises ValueError describing the first problem found.
+    """
+    if not isinstance(row, dict):
+        raise ValueError("not a valid record")
+    description = str(row.get('description') or '').strip()
+    if not description:
+        raise ValueError("description cannot be empty")
+    cents = to_cents(row.get('amount'))
+    if cents <= 0:
+        raise ValueError("amount must be a positive number")
+    expense_date = row.get('date') or get_time_stamp()
+    if day_ordinal(expense_date) is None:
+        raise ValueError(f"invalid date {expense_date!r}")
+    return {
+        'id': None,
+        'date': expense_date,
+        'description': description,
+        'cents': cents,
+        'category': row.get('category') or "None",
+    }
+
+def import_expenses(filename, fmt=None, check_budget=True, session=None):
+    """
+    Bulk-load expenses from a CSV or JSON-lines file in BATCH_SIZE batches.
+    Invalid rows are reported and skipped. With `check_budget`, rows that
+    would push their month over budget are skipped as well.
+    """
+    import csv
+    session = session or ExpenseSession()
+    imported = skipped = 0
+    month_totals = {}
+
+    try:
+        rows = read_import_rows(filename, fmt)
+        with session.transaction():
+            while chunk := list(islice(rows, BATCH_SIZE)):
+                batch = []
+                for line_no, row in chunk:
+                    try:
+                        expense = parse_import_row(row)
+                    except ValueError as e:
+                        print(f"⚠️ Skipping line {line_no}: {e}")
+                        skipped += 1
+                        continue
+
+                    if check_budget:
+                        year, month = (int(part) for part in expense['date'].split('-')[:2])
+                        if (year, month) not in month_totals:
+                            month_totals[(year, month)] = session.month_total(year, month)
+                        budget = session.budget_for(year, month)
+                        if budget_state(month_totals[(year, month)] + expense['cents'], budget) == 'over':
+                            print(f"⚠️ Skipping line {line_no}: monthly budget for {year}-{month:02d} exceeded")
+                            skipped += 1
+                            continue
+                        month_totals[(year, month)] += expense['cents']
+
+                    batch.append(expense)
+
+                if batch:
+                    first_id = session.reserve_ids(len(batch))
+                    for offset, expense in enumerate(batch):
+                        expense['id'] = first_id + offset
+                    session.add_many(batch)
+                    imported += len(batch)
+    except (OSError, csv.Error) as e:
+        print(f"❌ Failed to import {filename}: {e}")
+        return
+    print(f"✅ Imported {imported} expenses from {filename} ({skipped} skipped)")
+    for (year, month), spent in sorted(month_totals.items()):
+        budget = session.budget_for(year, month)
+        if budget_state(spent, budget) == 'warn':
+            warn_budget(year, month, spent, budget)
     
-def get_summary():
+def get_summary(session=None):
     """
     Print the total sum of all expenses.
     """
-    expenses = load_expenses()
-    total = sum(expense['amount'] for expense in expenses)
+    total = from_cents((session or ExpenseSession()).total())
     print(f"📊 Total Expenses: $ {total:.2f}")
 
-def get_filter_summary(month):
+def get_filter_summary(month, year, session=None):
     """
-    Calculate the total expenses for a specific month.
-    Returns the sum as a float.
+    Calculate the total expenses for a specific month of a year.
+    Returns the sum in integer cents.
     """
-    expenses = load_expenses()
-    total = 0
-    for expense in expenses:
-        try:
-            exp_month = int(expense['date'].split('-')[1])
-            if exp_month == month:
-                total += expense['amount']
-        except (IndexError, ValueError):
-            continue
-    return total
+    return (session or ExpenseSession()).month_total(year, month)
 
-def get_category_summary(category):
+def get_range_summary(start=None, end=None, session=None):
+    """
+    Print the total expenses between two dates (inclusive).
+    """
+    total = from_cents((session or ExpenseSession()).range_total(start, end))
+    print(f"📅 Total expenses from {start or 'the first entry'} to {end or 'the last entry'}: $ {total:.2f}")
+
+def get_category_summary(category, session=None):
     """
     Print the total expenses for a specific category.
     """
-    expenses = load_expenses()
-    total = 0
-    for expense in expenses:
+    total = from_cents((session or ExpenseSession()).category_total(category))
+    print(f"📅 Total expenses of {category}: $ {total:.2f}")
+
+def run_command(argv, session):
+    """
+    Run one CLI command against an already open session and return
+    everything it printed.
+    """
+    output = io.StringIO()
+    with redirect_stdout(output), redirect_stderr(output):
         try:
-            if expense['category'] == category:            
-                total += expense['amount']
-        except (IndexError, ValueError):
+            main(argv, session)
+        except SystemExit:
+            pass
+    return output.getvalue()
+
+def read_request(conn):
+    """
+    Read a client's JSON request; the client closes its side when done.
+    """
+    chunks = []
+    while chunk := conn.recv(65536):
+        chunks.append(chunk)
+    return json.loads(b''.join(chunks))
+
+def serve(session, path=SOCKET_FILE):
+    """
+    Keep the session and its indexes in memory and run the commands that
+    expense_client.py forwards over a Unix socket, one at a time.
+    The store lock is taken by the first command and held while commands
+    keep arriving; their commits are flushed together after FLUSH_DELAY of
+    idle time (or FLUSH_MAX_HOLD at the latest) and the lock released.
+    """
+    import socket
+    if not hasattr(socket, 'AF_UNIX'):
+        print("❌ Error: serve needs Unix domain sockets")
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+        print(f"❌ Error: A server is already listening on {path}")
+        return
+    except OSError:
+        if os.path.exists(path):
+            os.remove(path)
+    finally:
+        probe.close()
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(64)
+    hold = ExitStack()
+    held_since = None
+
+    def release():
+        nonlocal held_since
+        if held_since is not None:
+            session.flush()
+            session.defer_commits = False
+            hold.close()
+            held_since = None
+
+    print(f"🛰️ Serving expenses on {path} (Ctrl+C to stop)", flush=True)
+    try:
+        while True:
+            if held_since is None:
+                server.settimeout(None)
+            else:
+                server.settimeout(max(0, min(FLUSH_DELAY, held_since + FLUSH_MAX_HOLD - time.monotonic())))
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                release()
+                continue
+            with conn:
+                conn.settimeout(5)
+                try:
+                    argv = read_request(conn)['argv']
+                    if held_since is None:
+                        hold.enter_context(session.transaction())
+                        session.defer_commits = True
+                        held_since = time.monotonic()
+                    conn.sendall(run_command(argv, session).encode('utf-8'))
+                except (OSError, ValueError, KeyError):
+                    pass
+            if held_since is not None and time.monotonic() - held_since >= FLUSH_MAX_HOLD:
+                release()
+    except KeyboardInterrupt:
+        print("\n👋 Server stopped")
+    finally:
+        release()
+        server.close()
+        os.remove(path)
+
+def repl(session):
+    """
+    Read commands interactively and run them against one in-memory session.
+    Each command commits on its own, so other processes see it immediately.
+    """
+    import shlex
+    print("🧾 Expense tracker shell. Type a command (e.g. `list --limit 5`), `help` or `exit`.")
+    while True:
+        try:
+            line = input("expenses> ")
+        except (EOFError, KeyboardInterrupt):
+            print()
+            return
+        if line.strip() in ("exit", "quit"):
+            return
+        try:
+            argv = shlex.split(line)
+        except ValueError as e:
+            print(f"❌ Error: {e}")
             continue
-    print(f"📅 Total expenses of {category}: $ {total:.2f}")
+        if argv:
+            try:
+                main(["--help"] if argv == ["help"] else argv, session)
+            except SystemExit:
+                pass
 
-def main():
+def main(argv=None, session=None):
     """
     Main entry point for the CLI application.
     Parses command-line arguments and calls the appropriate function.
+    `serve` and `repl` pass their open session to reuse it across commands.
     """
-    if len(sys.argv) < 2:
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv:
         print("❗ Please provide a command: add, delete, list, summary")
         sys.exit()
 
-    parser = argparse.ArgumentParser(description="🧾 Simple CLI Expense Tracker")
+    parser = argparse.ArgumentParser(prog="Expense_tracker.py", description="🧾 Simple CLI Expense Tracker")
+    parser.add_argument('--db', help="Use this SQLite database instead of the JSON files (or set EXPENSE_DB)",
+                        default=os.environ.get('EXPENSE_DB'))
     subparsers = parser.add_subparsers(dest="command")
 
     # Add command parser
     add_parser = subparsers.add_parser("add", help="Add an expense")
     add_parser.add_argument('--description', help="Description of the item", required=True)
-    add_parser.add_argument('--amount', help="Amount spent", type=float, required=True)
+    # Amounts stay strings until to_cents() so no float rounding creeps in
+    add_parser.add_argument('--amount', help="Amount spent", required=True)
     add_parser.add_argument('--category', help="Tell which category the expense belong", default="None", required=False)
 
     # Delete command parser
@@ -260,46 +1906,120 @@ def main():
     delete_parser.add_argument('--id', type=int, required=True, help="Expense ID to delete")
 
     # List command parser
-    subparsers.add_parser("list", help="List all recorded expenses")
+    list_parser = subparsers.add_parser("list", help="List all recorded expenses")
+    list_parser.add_argument('--limit', type=int, help="Show at most this many expenses")
+    list_parser.add_argument('--offset', type=int, default=0, help="Skip this many expenses first")
+    list_parser.add_argument('--page-size', type=int, help="Repeat the table header every N rows")
+    list_parser.add_argument('--format', choices=["table", "jsonl", "tsv"], default="table",
+                             help="Output format (jsonl/tsv skip table layout for use in pipes)")
 
     # Summary command parser
     summary_parser = subparsers.add_parser("summary", help="Get total expense summary")
     summary_parser.add_argument('--category', help="Get summary filtered by category")
     summary_parser.add_argument('--month', help="Get summary of a specific month", type=int, choices=range(1, 13))
+    summary_parser.add_argument('--year', help="Year of --month (defaults to the current year)", type=int)
+    summary_parser.add_argument('--from', dest='start', help="Start date (YYYY-MM-DD) of a summary range", type=date.fromisoformat)
+    summary_parser.add_argument('--to', dest='end', help="End date (YYYY-MM-DD) of a summary range", type=date.fromisoformat)
 
     # Budget setting command parser
-    budget_parser = subparsers.add_parser("budget", help="Set budget for a category")
-    budget_parser.add_argument('--month', help="Set budget of a specific month", type=int, choices=range(1, 13), required=True)
-    budget_parser.add_argument('--amount', help='set amount of the budget', type=float, required=True)
+    budget_parser = subparsers.add_parser("budget", help="Set a monthly budget, or show budget status")
+    budget_parser.add_argument('action', nargs='?', choices=["set", "status"], default="set",
+                               help="`status` shows spending against every budgeted month of the year")
+    budget_parser.add_argument('--month', help="Set budget of a specific month", type=int, choices=range(1, 13))
+    budget_parser.add_argument('--year', help="Year of the budget (defaults to the current year)", type=int)
+    budget_parser.add_argument('--amount', help='set amount of the budget')
+    budget_parser.add_argument('--warn', type=float,
+                               help=f"Warn once spending reaches this percent of the budget (default {BUDGET_WARN_PERCENT})")
+    budget_parser.add_argument('--hard', type=float,
+                               help=f"Refuse expenses past this percent of the budget (default {BUDGET_HARD_PERCENT})")
+    budget_parser.add_argument('--format', choices=["table", "jsonl", "tsv"], default="table",
+                               help="Output format of `status`")
     
     # Export to CSV command parser
     export_parser = subparsers.add_parser("export", help="Export all expenses to CSV")
     export_parser.add_argument('--filename', help="Specify the output CSV filename", default="Expenses_Summary.csv")
+    export_parser.add_argument('--gzip', action='store_true', default=None, help="Gzip the output (implied by a .gz filename)")
+    export_parser.add_argument('--category', help="Only export this category")
+    export_parser.add_argument('--from', dest='start', help="Only export from this date (YYYY-MM-DD)", type=date.fromisoformat)
+    export_parser.add_argument('--to', dest='end', help="Only export up to this date (YYYY-MM-DD)", type=date.fromisoformat)
+
+    # Import command parser
+    import_parser = subparsers.add_parser("import", help="Bulk-load expenses from a CSV or JSON-lines file")
+    import_parser.add_argument('--filename', help="CSV or JSON-lines file to import (optionally .gz)", required=True)
+    import_parser.add_argument('--format', choices=["csv", "jsonl"], help="File format (guessed from the extension by default)")
+    import_parser.add_argument('--skip-budget-check', action='store_true', help="Import rows even if they exceed the monthly budget")
+
+    # Compact command parser
+    compact_parser = subparsers.add_parser("compact", help="Fold the expense journal back into the snapshot")
+    compact_parser.add_argument('--format', choices=["json", "columnar"],
+                                help="Switch the snapshot format (columnar suits large ledgers)")
+
+    # Reindex command parser
+    subparsers.add_parser("reindex", help="Rebuild the summary index from the ledger")
+
+    # Migrate command parser
+    migrate_parser = subparsers.add_parser("migrate", help="Copy the JSON files into an SQLite database")
+    migrate_parser.add_argument('--to', dest='target', help="SQLite database to migrate into", required=True)
+
+    # Serve command parser
+    serve_parser = subparsers.add_parser("serve", help="Keep the store in memory and run commands sent by expense_client.py")
+    serve_parser.add_argument('--socket', help="Unix socket to listen on (or set EXPENSE_SOCKET)", default=SOCKET_FILE)
+
+    # REPL command parser
+    subparsers.add_parser("repl", help="Run commands interactively against one in-memory store")
 
     try:
-        args = parser.parse_args()
+        args = parser.parse_args(argv)
+        if session is not None and args.command in ("serve", "repl"):
+            print("❌ Error: Already running inside a server or shell")
+            return
+        # Every command in this invocation shares one load of each store
+        if session is None:
+            session = open_session(args.db)
         match args.command:
             case "add":
-                add_to_cart(args.description, args.amount, args.category)
+                add_to_cart(args.description, args.amount, args.category, session)
             case "delete":
-                remove_from_cart(args.id)
+                remove_from_cart(args.id, session)
+            case "budget" if args.action == "status":
+                budget_status(args.year, session, args.format)
             case "budget":
-                set_budget(args.month, args.amount)
+                if args.month is None or args.amount is None:
+                    budget_parser.error("setting a budget needs --month and --amount")
+                set_budget(args.month, args.amount, args.year, session, args.warn, args.hard)
             case "list":
-                get_list()
+                get_list(session, args.limit, args.offset, args.page_size, args.format)
             case "export":
-                create_expenses_csv(args.filename)
+                create_expenses_csv(args.filename, session, args.start, args.end, args.category, args.gzip)
+            case "import":
+                import_expenses(args.filename, args.format, not args.skip_budget_check, session)
+            case "compact":
+                compact_journal(session, args.format)
+            case "reindex":
+                rebuild_index(session)
+            case "migrate":
+                migrate_to_sqlite(args.target, session)
+            case "serve":
+                serve(session, args.socket)
+            case "repl":
+                repl(session)
             case "summary":
-                if args.month:
-                    total = get_filter_summary(args.month)
-                    month_name = datetime(1900, args.month, 1).strftime('%B')
+                if args.start or args.end:
+                    get_range_summary(args.start, args.end, session)
+                elif args.month:
+                    year = args.year or datetime.now().year
+                    total = from_cents(get_filter_summary(args.month, year, session))
+                    month_name = datetime(year, args.month, 1).strftime('%B %Y')
                     print(f"📅 Total expenses for {month_name}: $ {total:.2f}")
                 elif args.category:
-                    get_category_summary(args.category)
+                    get_category_summary(args.category, session)
                 else:
-                    get_summary()
+                    get_summary(session)
             case _:
                 print("❌ Invalid command. Use --help for usage info.")
+    except BrokenPipeError:
+        # The reader of a pipe (e.g. `| head`) went away; stop quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
     except Exception as e:
         print(f"🚨 An error occurred: {e}")
 
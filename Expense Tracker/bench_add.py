@@ -0,0 +1,111 @@
+"""
+Benchmark the latency of a single `add` against ledgers of different sizes.
+
+"before" replays what `add` used to do: parse cart_list.json three times
+(add_to_cart, create_id, get_filter_summary), parse monthly_budget.json and
+rewrite the whole ledger. "after" runs the current add_to_cart with a fresh
+ExpenseSession, exactly as one CLI invocation would.
+
+Usage:
+    python bench_add.py [--sizes 1000 100000 1000000] [--repeat 5]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import tempfile
+import time
+
+import Expense_tracker as tracker
+
+
+def make_ledger(size):
+    """
+    Write a snapshot of `size` synthetic expenses and a generous budget.
+    """
+    today = tracker.get_time_stamp()
+    expenses = [
+        {
+            'id': i,
+            'date': today,
+            'description': f"Expense {i}",
+            'amount': 1.0,
+            'category': "Food",
+        }
+        for i in range(1, size + 1)
+    ]
+    with open(tracker.EXPENSE_FILE, 'w') as f:
+        json.dump(expenses, f, indent=2)
+    with open(tracker.BUDGET_FILE, 'w') as f:
+        json.dump([{'month': m, 'amount': float(size * 10)} for m in range(1, 13)], f)
+    if os.path.exists(tracker.JOURNAL_FILE):
+        os.remove(tracker.JOURNAL_FILE)
+
+
+def legacy_add(desc, amount, category):
+    """
+    The original add path: three ledger parses and a full rewrite.
+    """
+    def load(path):
+        with open(path) as f:
+            return json.load(f)
+
+    expenses = load(tracker.EXPENSE_FILE)
+    expense = {
+        'id': max([e['id'] for e in load(tracker.EXPENSE_FILE)], default=0) + 1,
+        'date': tracker.get_time_stamp(),
+        'description': desc,
+        'amount': round(amount, 2),
+        'category': category,
+    }
+    month = int(expense['date'].split('-')[1])
+    budgets = load(tracker.BUDGET_FILE)
+    current = sum(e['amount'] for e in load(tracker.EXPENSE_FILE)
+                  if int(e['date'].split('-')[1]) == month)
+    monthly_budget = next((b['amount'] for b in budgets if b['month'] == month), 0)
+    if expense['amount'] + current > monthly_budget:
+        return
+    expenses.append(expense)
+    with open(tracker.EXPENSE_FILE, 'w') as f:
+        json.dump(expenses, f, indent=2)
+
+
+def current_add(desc, amount, category):
+    tracker.add_to_cart(desc, amount, category, tracker.ExpenseSession())
+
+
+def time_add(add, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            add("Benchmark", 1.0, "Food")
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark `add` latency before/after")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'expenses':>10}  {'before (ms)':>12}  {'after (ms)':>12}  {'speedup':>8}")
+    cwd = os.getcwd()
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                make_ledger(size)
+                before = time_add(legacy_add, args.repeat)
+                make_ledger(size)
+                after = time_add(current_add, args.repeat)
+            finally:
+                os.chdir(cwd)
+        print(f"{size:>10}  {before * 1000:>12.2f}  {after * 1000:>12.2f}  {before / after:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark per-command latency of the cold CLI against `serve`.
+
+For each command it reports the median wall time of:
+  cold    - `python Expense_tracker.py ...` (start-up, imports, store load)
+  client  - `python expense_client.py ...` talking to a running server
+  socket  - one request sent straight to the server socket (no interpreter start)
+
+Usage:
+    python bench_serve.py [--rows 100000] [--repeat 20]
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import Expense_tracker as tracker
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SCRIPT = os.path.join(HERE, "Expense_tracker.py")
+CLIENT = os.path.join(HERE, "expense_client.py")
+
+COMMANDS = [
+    ["add", "--description", "Benchmark", "--amount", "1", "--category", "Food"],
+    ["summary", "--month", "1"],
+    ["list", "--limit", "5", "--format", "tsv"],
+]
+
+
+def make_ledger(rows):
+    """
+    Write a snapshot of `rows` synthetic expenses and a generous budget.
+    """
+    today = tracker.get_time_stamp()
+    with open(tracker.EXPENSE_FILE, 'w') as f:
+        json.dump([
+            {'id': i, 'date': today, 'description': f"Expense {i}", 'amount': 1.0, 'category': "Food"}
+            for i in range(1, rows + 1)
+        ], f, indent=2)
+    with open(tracker.BUDGET_FILE, 'w') as f:
+        json.dump([{'month': m, 'amount': float(rows * 100)} for m in range(1, 13)], f)
+
+
+def time_process(argv, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def time_socket(argv, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(tracker.SOCKET_FILE)
+            client.sendall(json.dumps({'argv': argv}).encode('utf-8'))
+            client.shutdown(socket.SHUT_WR)
+            while client.recv(65536):
+                pass
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold CLI vs serve latency")
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            make_ledger(args.rows)
+            # Warm the index once so the cold runs measure steady state
+            subprocess.run([sys.executable, SCRIPT, "reindex"], stdout=subprocess.DEVNULL, check=True)
+            cold = [time_process([sys.executable, SCRIPT] + argv, args.repeat) for argv in COMMANDS]
+
+            server = subprocess.Popen([sys.executable, SCRIPT, "serve"], stdout=subprocess.DEVNULL)
+            try:
+                while not os.path.exists(tracker.SOCKET_FILE):
+                    time.sleep(0.01)
+                warm = [time_process([sys.executable, CLIENT] + argv, args.repeat) for argv in COMMANDS]
+                raw = [time_socket(argv, args.repeat) for argv in COMMANDS]
+            finally:
+                server.send_signal(signal.SIGINT)
+                server.wait()
+        finally:
+            os.chdir(cwd)
+
+    print(f"{'command':<10}  {'cold (ms)':>10}  {'client (ms)':>12}  {'socket (ms)':>12}")
+    for argv, c, w, r in zip(COMMANDS, cold, warm, raw):
+        print(f"{argv[0]:<10}  {c * 1000:>10.2f}  {w * 1000:>12.2f}  {r * 1000:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+"""
+Thin client for `Expense_tracker.py serve`.
+
+Forwards its arguments to the server listening on the Unix socket in the
+current directory and prints the reply. It only imports what it needs to
+talk to the socket, so a command costs an interpreter start-up and one
+round trip. When no server is listening it runs Expense_tracker.py itself.
+
+Usage:
+    python Expense_tracker.py serve &
+    python expense_client.py add --description "Lunch" --amount 150 --category Food
+"""
+import json
+import os
+import socket
+import sys
+
+SOCKET_FILE = os.environ.get('EXPENSE_SOCKET', "cart_list.sock")
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Expense_tracker.py")
+
+
+def main():
+    argv = sys.argv[1:]
+    try:
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.connect(SOCKET_FILE)
+    except (AttributeError, OSError):
+        # No server: fall back to the regular CLI
+        os.execv(sys.executable, [sys.executable, SCRIPT] + argv)
+    with client:
+        client.sendall(json.dumps({'argv': argv}).encode('utf-8'))
+        client.shutdown(socket.SHUT_WR)
+        while chunk := client.recv(65536):
+            sys.stdout.buffer.write(chunk)
+    sys.stdout.flush()
+
+
+if __name__ == '__main__':
+    main()
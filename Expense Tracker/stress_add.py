@@ -0,0 +1,85 @@
+"""
+Multi-process stress test for concurrent `add` commands.
+
+Starts hundreds of `Expense_tracker.py add` processes at once against a
+fresh store in a temporary directory, then checks that every add was kept
+and that no expense ID was handed out twice.
+
+Usage:
+    python stress_add.py [--processes 200] [--db]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+
+import Expense_tracker as tracker
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Expense_tracker.py")
+
+
+def run_adds(workdir, processes, db):
+    """
+    Launch `processes` concurrent adds and wait for all of them.
+    Returns the number of processes that reported success.
+    """
+    prefix = [sys.executable, SCRIPT] + (["--db", db] if db else [])
+    procs = [
+        subprocess.Popen(
+            prefix + ["add", "--description", f"stress {i}", "--amount", "1", "--category", "Stress"],
+            cwd=workdir, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+        )
+        for i in range(processes)
+    ]
+    succeeded = 0
+    for proc in procs:
+        output, _ = proc.communicate()
+        if "✅" in output:
+            succeeded += 1
+        else:
+            print(f"⚠️ add failed: {output.strip()}")
+    return succeeded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stress-test concurrent expense adds")
+    parser.add_argument('--processes', type=int, default=200)
+    parser.add_argument('--db', action='store_true', help="Run against an SQLite store instead of JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        now = datetime.now()
+        with open(os.path.join(workdir, tracker.BUDGET_FILE), 'w') as f:
+            json.dump([{'year': now.year, 'month': now.month, 'amount': float(args.processes * 10)}], f)
+
+        db = "stress.db" if args.db else None
+        if db:
+            cwd = os.getcwd()
+            os.chdir(workdir)
+            try:
+                tracker.migrate_to_sqlite(db)
+            finally:
+                os.chdir(cwd)
+
+        succeeded = run_adds(workdir, args.processes, db)
+
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            ids = [expense['id'] for expense in tracker.open_session(db).expenses]
+        finally:
+            os.chdir(cwd)
+
+    duplicates = len(ids) - len(set(ids))
+    print(f"processes: {args.processes}  succeeded: {succeeded}  stored: {len(ids)}  duplicate IDs: {duplicates}")
+    if succeeded != args.processes or len(ids) != args.processes or duplicates:
+        print("❌ Lost writes or duplicate IDs detected")
+        sys.exit(1)
+    print("✅ No lost writes and no duplicate IDs")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,64 +1,706 @@
 import json
+import os
 import sys
-import requests
+import time
 
+# Point at a local stub server (see stub_github.py) to try the CLI offline
+API_URL = os.environ.get("GITHUB_API_URL", "https://api.github.com")
+DEFAULT_CONCURRENCY = 8
 
-def get_user_activity(username):
-    url=f"https://api.github.com/users/{username}/events"
-    
+# Responses are cached per URL with their ETag, so repeat runs send
+# conditional requests; 304 replies don't count against the rate limit
+CACHE_DIR = os.environ.get("GITHUB_ACTIVITY_CACHE", ".github_cache")
+CACHE_TTL = 24 * 60 * 60
+CACHE_MAX_BYTES = 50 * 1024 * 1024
+# A put() takes milliseconds; temporary files older than this were left by a crash
+CACHE_STALE_TMP = 10 * 60
+# Used when the API doesn't send X-Poll-Interval
+DEFAULT_POLL_INTERVAL = 60
+
+# Newest event already shown per user, for --new-only and --watch
+STATE_FILE = os.environ.get("GITHUB_ACTIVITY_STATE", ".github_state.json")
+
+# Events shown per user unless --limit says otherwise (one page, as before)
+DEFAULT_LIMIT = 30
+# GitHub serves at most 100 events per page and 300 per feed
+MAX_PER_PAGE = 100
+MAX_PAGES = 10
+
+# Every request gives up after this many seconds without a response, and
+# is retried with jittered exponential backoff on 5xx and connection errors
+REQUEST_TIMEOUT = 10
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 30
+RETRY_STATUSES = {500, 502, 503, 504}
+
+
+class EventCache:
+    # One JSON file per URL: ETag, poll interval, fetch time and parsed events
+
+    def __init__(self, path=CACHE_DIR, ttl=CACHE_TTL, max_bytes=CACHE_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        os.makedirs(path, exist_ok=True)
+
+    def file_for(self, url):
+        # hashlib loads OpenSSL; keep it off the usage path
+        import hashlib
+        return os.path.join(self.path, hashlib.sha1(url.encode()).hexdigest() + ".json")
+
+    def get(self, url):
+        # Returns None for missing, unreadable or expired entries
+        try:
+            with open(self.file_for(url)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get('url') != url or time.time() - entry.get('fetched_at', 0) > self.ttl:
+            return None
+        return entry
+
+    def put(self, url, etag, poll_interval, events, next_url=None):
+        entry = {
+            'url': url,
+            'etag': etag,
+            'poll_interval': poll_interval,
+            'fetched_at': time.time(),
+            'next': next_url,
+            'events': events,
+        }
+        path = self.file_for(url)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        # The cache is best effort: a failed write only costs a download next time
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+        return entry
+
+    def evict(self):
+        # Drop expired entries and stale temporary files, then the least
+        # recently written entries until under max_bytes. Another process
+        # may be evicting the same cache, so files can vanish at any step
+        entries = []
+        try:
+            scan = list(os.scandir(self.path))
+        except OSError:
+            return
+        now = time.time()
+        for entry in scan:
+            if entry.name.endswith(".json"):
+                max_age = self.ttl
+            elif entry.name.endswith(".tmp"):
+                max_age = CACHE_STALE_TMP
+            else:
+                continue
+            try:
+                stat = entry.stat()
+                if now - stat.st_mtime > max_age:
+                    os.remove(entry.path)
+                    continue
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+
+def commit_count(payload):
+    # `commits` lists at most 20 commits; `size` is the real number when given
+    return payload.get("size", len(payload.get("commits", ())))
+
+
+# One line per event type, from (payload, repo name); other types get a generic line
+EVENT_FORMATS = {
+    "PushEvent": lambda payload, repo: f"📦 Pushed {commit_count(payload)} commit(s) to {repo}",
+    "IssuesEvent": lambda payload, repo: f"🐞 {payload['action'].title()} issue '{payload['issue']['title']}' in {repo}",
+    "WatchEvent": lambda payload, repo: f"⭐ Starred {repo}",
+    "ForkEvent": lambda payload, repo: f"🍴 Forked {repo} to {payload['forkee']['full_name']}",
+    "CreateEvent": lambda payload, repo: f"🆕 Created {payload['ref_type']} {payload.get('ref') or ''} in {repo}",
+}
+
+
+def format_event(event):
+    type = event["type"]
+    repo_name = event["repo"]["name"]
+    format = EVENT_FORMATS.get(type)
+    if format:
+        return format(event["payload"], repo_name)
+    return f"🔔 {type} in {repo_name}"
+
+
+def count_commits(stats, event):
+    stats.commits += commit_count(event["payload"])
+
+
+# Extra counting for some event types, on top of the per type/repo/day counts
+STATS_HANDLERS = {
+    "PushEvent": count_commits,
+}
+
+
+class ActivityStats:
+    # Event counts folded from the feeds in one pass; no event is kept
+
+    def __init__(self):
+        import threading
+
+        self.lock = threading.Lock()
+        self.users = 0
+        self.events = 0
+        self.commits = 0
+        self.types = {}
+        self.repos = {}
+        self.days = {}
+
+    def add(self, event):
+        type = event["type"]
+        repo_name = event["repo"]["name"]
+        day = event["created_at"][:10]
+        self.events += 1
+        self.types[type] = self.types.get(type, 0) + 1
+        self.repos[repo_name] = self.repos.get(repo_name, 0) + 1
+        self.days[day] = self.days.get(day, 0) + 1
+        handler = STATS_HANDLERS.get(type)
+        if handler:
+            handler(self, event)
+
+    def merge(self, other):
+        # Each worker folds its own user, then adds the result here
+        with self.lock:
+            self.users += other.users
+            self.events += other.events
+            self.commits += other.commits
+            for counts, more in ((self.types, other.types), (self.repos, other.repos), (self.days, other.days)):
+                for key, count in more.items():
+                    counts[key] = counts.get(key, 0) + count
+
+    def to_dict(self):
+        def by_count(counts):
+            return dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+
+        return {
+            'users': self.users,
+            'events': self.events,
+            'commits': self.commits,
+            'types': by_count(self.types),
+            'repos': by_count(self.repos),
+            'days': dict(sorted(self.days.items())),
+        }
+
+    def table(self, top=10):
+        data = self.to_dict()
+        lines = [f"📊 {self.events} event(s) from {self.users} user(s), {self.commits} commit(s) pushed"]
+        sections = [("Event type", data['types']), ("Repository", data['repos']), ("Day", data['days'])]
+        for title, counts in sections:
+            rows = list(counts.items())
+            # Days are listed in full; the other sections show the busiest rows
+            if title != "Day" and top and len(rows) > top:
+                rows = rows[:top] + [(f"({len(rows) - top} more)", sum(count for _, count in rows[top:]))]
+            width = max([len(title)] + [len(key) for key, _ in rows])
+            lines.append("")
+            lines.append(f"{title:<{width}}  {'Events':>7}")
+            lines.extend(f"{key:<{width}}  {count:>7}" for key, count in rows)
+        return lines
+
+
+class SeenState:
+    # Newest event seen per user ({'id', 'created_at'}), kept between runs
+
+    def __init__(self, path=STATE_FILE):
+        import threading
+
+        self.path = path
+        self.lock = threading.Lock()
+        try:
+            with open(path) as f:
+                self.marks = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.marks = {}
+        self.new_events = 0
+        self.poll_interval = 0
+
+    def mark(self, username):
+        return self.marks.get(username)
+
+    def record(self, username, newest, new_events, poll_interval):
+        # Called from worker threads once per user and cycle
+        with self.lock:
+            mark = self.marks.get(username)
+            if newest and (mark is None or is_newer(newest, mark)):
+                self.marks[username] = {'id': newest['id'], 'created_at': newest['created_at']}
+            self.new_events += new_events
+            self.poll_interval = max(self.poll_interval, poll_interval)
+
+    def start_cycle(self):
+        self.new_events = 0
+        self.poll_interval = 0
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.marks, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+def is_newer(event, mark):
+    # Event IDs grow over time; created_at decides if they aren't numeric
+    try:
+        return int(event['id']) > int(mark['id'])
+    except (TypeError, ValueError):
+        return event['created_at'] > mark['created_at']
+
+
+class Page:
+    # One fetched page of a feed; events is None if the request failed
+
+    def __init__(self, status, events=None, next_url=None, source=None, poll_interval=DEFAULT_POLL_INTERVAL):
+        self.status = status
+        self.events = events
+        self.next_url = next_url
+        self.source = source
+        self.poll_interval = poll_interval
+
+
+def fetch_page(url, session=None, cache=None):
+    # `source` says whether the events came from the cache without a request
+    # ("cached") or after a 304 ("not modified")
+    import requests
+
+    entry = cache.get(url) if cache else None
+    # Within the poll interval GitHub asks for, the cached copy is current
+    if entry and time.time() - entry['fetched_at'] < entry['poll_interval']:
+        return Page(200, entry['events'], entry.get('next'), "cached", entry['poll_interval'])
+
+    headers = {'If-None-Match': entry['etag']} if entry and entry.get('etag') else {}
+    if session:
+        response = session.get(url, headers=headers)
+    else:
+        response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
     try:
-        response=requests.get(url)
-        print(response.status_code)
-        
-        if (response.status_code==200):
-            
-            events = response.json()
-            if not events:
-                print("No recent activity found.")
+        poll_interval = int(response.headers.get('X-Poll-Interval', DEFAULT_POLL_INTERVAL))
+    except ValueError:
+        poll_interval = DEFAULT_POLL_INTERVAL
+
+    if response.status_code == 304 and entry:
+        cache.put(url, entry['etag'], poll_interval, entry['events'], entry.get('next'))
+        return Page(200, entry['events'], entry.get('next'), "not modified", poll_interval)
+    if response.status_code == 200:
+        events = response.json()
+        next_url = response.links.get('next', {}).get('url')
+        if cache:
+            cache.put(url, response.headers.get('ETag'), poll_interval, events, next_url)
+        return Page(200, events, next_url, None, poll_interval)
+    return Page(response.status_code, poll_interval=poll_interval)
+
+
+def iter_pages(url, session=None, cache=None):
+    # Follows Link rel="next" one request at a time, only while the caller keeps
+    # asking; stops after a failed page
+    for _ in range(MAX_PAGES):
+        page = fetch_page(url, session, cache)
+        yield page
+        url = page.next_url
+        if page.events is None or not url:
+            return
+
+
+def select_events(pages, limit=None, since=None, types=None, after=None):
+    # Streams matching events newest first and stops pulling pages as soon as
+    # `limit` events are found or the feed reaches `since` or the `after` mark
+    count = 0
+    for page in pages:
+        for event in page.events or ():
+            if since and event['created_at'] < since:
+                return
+            if after and not is_newer(event, after):
                 return
+            if types and event['type'] not in types:
+                continue
+            yield event
+            count += 1
+            if limit and count >= limit:
+                return
+
+
+def events_url(api_url, username, limit=None, since=None, types=None):
+    # Unfiltered short listings fit in one page of exactly `limit` events
+    per_page = MAX_PER_PAGE if since or types or not limit else min(limit, MAX_PER_PAGE)
+    return f"{api_url}/users/{username}/events?per_page={per_page}"
+
 
-            for event in events:
-                type = event["type"]
-                repo_name = event["repo"]["name"]
-
-                if type == "PushEvent":
-                    commit_count = len(event["payload"]["commits"])
-                    print(f"📦 Pushed {commit_count} commit(s) to {repo_name}")
-                elif type == "IssuesEvent":
-                    action = event["payload"]["action"]
-                    issue = event["payload"]["issue"]["title"]
-                    print(f"🐞 {action.title()} issue '{issue}' in {repo_name}")
-                elif type == "WatchEvent":
-                    print(f"⭐ Starred {repo_name}")
-                elif type == "ForkEvent":
-                    forked_to = event["payload"]["forkee"]["full_name"]
-                    print(f"🍴 Forked {repo_name} to {forked_to}")
-                elif type == "CreateEvent":
-                    ref_type = event["payload"]["ref_type"]
-                    ref = event["payload"].get("ref", "")
-                    print(f"🆕 Created {ref_type} {ref} in {repo_name}")
-                else:
-                    print(f"🔔 {type} in {repo_name}")
-
-        elif response.status_code == 404:
-            print("❌ User not found. Please check the username.")
-        else:
-            print(f"❌ Failed to fetch data. Status code: {response.status_code}")
+def get_user_activity(username, session=None, api_url=API_URL, cache=None,
+                      limit=DEFAULT_LIMIT, since=None, types=None, state=None, stats=None):
+    # With `state`, only events newer than the user's mark are shown, and a
+    # user without any is left out of the output entirely.
+    # With `stats`, events are counted into it instead and only errors are returned
+    # Imported here so printing usage doesn't pay for loading requests
+    import requests
 
+    url = events_url(api_url, username, limit, since, types)
+    # Lines are collected and printed together so concurrent users don't interleave
+    lines = [f"👤 {username}"]
+    after = state.mark(username) if state else None
+    user_stats = ActivityStats() if stats else None
+    # Only the first and last pages are kept for the status checks below
+    first = last = None
+    pages = 0
+
+    def fetched():
+        nonlocal first, last, pages
+        for page in iter_pages(url, session, cache):
+            first = first or page
+            last = page
+            pages += 1
+            yield page
+
+    try:
+        for event in select_events(fetched(), limit, since, types, after):
+            if user_stats:
+                user_stats.add(event)
+            else:
+                lines.append(format_event(event))
     except requests.RequestException as e:
-        print("❌ Network error:", str(e))
-        
+        lines.append(f"❌ Network error: {e}")
+        if stats:
+            stats.merge(user_stats)
+        return lines
+
+    new_events = user_stats.events if stats else len(lines) - 1
+    if last.events is not None:
+        if stats:
+            user_stats.users = 1
+        if state:
+            # Everything newer than the old mark has been looked at now
+            newest = first.events[0] if first.events else None
+            state.record(username, newest, new_events, max(first.poll_interval, last.poll_interval))
+    # Events from a feed that broke off part way are still counted
+    if stats:
+        stats.merge(user_stats)
+
+    if first.source:
+        lines[0] += f" ({first.source})"
+    if first.status == 404:
+        lines.append("❌ User not found. Please check the username.")
+    elif first.events is None:
+        lines.append(f"❌ Failed to fetch data. Status code: {first.status}")
+    elif last.events is None:
+        lines.append(f"⚠️ Stopped after page {pages - 1}. Status code: {last.status}")
+    elif stats or (state and not new_events):
+        return []
+    elif len(lines) == 1:
+        lines.append("No recent activity found.")
+    return lines
+
+
+def make_session(concurrency):
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    # One keep-alive connection per worker, shared by every request to the API host
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_maxsize=concurrency)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Accept"] = "application/vnd.github+json"
+    return session
+
+
+def backoff(attempt):
+    # "Full jitter": anywhere up to the exponential delay, so retries spread out
+    import random
+
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+def parse_retry_after(value):
+    # Retry-After is either a number of seconds or an HTTP date
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RequestScheduler:
+    # Wraps a session for every worker: times requests out, retries them, and
+    # spends the API's rate limit as a token bucket. When it runs out, or the
+    # API answers 403/429 for rate limiting, all workers pause together
+
+    def __init__(self, session, timeout=REQUEST_TIMEOUT, retries=MAX_RETRIES):
+        import threading
+
+        self.session = session
+        self.timeout = timeout
+        self.retries = retries
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        # Requests left until reset_at, from X-RateLimit-*; None until known
+        self.remaining = None
+        self.reset_at = 0.0
+        self.paused_until = 0.0
+        self.in_flight = 0
+
+    def sleep(self, seconds):
+        # Cut short by close(), so Ctrl+C doesn't wait out a long pause
+        import requests
+
+        if self.stopped.wait(seconds):
+            raise requests.RequestException("Stopped")
 
-def main():
-    if len(sys.argv)<2:
+    def pause(self, seconds, reason):
+        with self.lock:
+            until = time.time() + seconds
+            if until > self.paused_until + 1:
+                print(f"⏳ {reason}; pausing all requests for {seconds:.0f}s", file=sys.stderr, flush=True)
+            self.paused_until = max(self.paused_until, until)
+
+    def acquire(self):
+        # Waits for the global pause to end and takes one token
+        while True:
+            with self.lock:
+                now = time.time()
+                if self.paused_until <= now and self.remaining is not None and self.remaining <= 0:
+                    if self.reset_at > now:
+                        print(f"⏳ Rate limit used up; pausing all requests for {self.reset_at - now:.0f}s",
+                              file=sys.stderr, flush=True)
+                        self.paused_until = self.reset_at
+                    else:
+                        # A new window has started; the next response tells how big it is
+                        self.remaining = None
+                wait = self.paused_until - now
+                if wait <= 0:
+                    if self.remaining is not None:
+                        self.remaining -= 1
+                    self.in_flight += 1
+                    return
+            self.sleep(wait)
+
+    def release(self, response=None):
+        # Refills the bucket from the rate limit headers. Requests still in
+        # flight may not be counted there yet, so they are taken off too, and
+        # the lower count for a window wins
+        with self.lock:
+            self.in_flight -= 1
+            try:
+                remaining = int(response.headers['X-RateLimit-Remaining']) - self.in_flight
+                reset_at = float(response.headers['X-RateLimit-Reset'])
+            except (AttributeError, KeyError, ValueError):
+                return
+            if reset_at == self.reset_at and self.remaining is not None:
+                remaining = min(remaining, self.remaining)
+            if reset_at >= self.reset_at:
+                self.remaining, self.reset_at = remaining, reset_at
+
+    def rate_limited(self, response):
+        if response.status_code == 429:
+            return True
+        # GitHub uses 403 for both rate limits and real permission errors
+        return response.status_code == 403 and (
+            response.headers.get('X-RateLimit-Remaining') == "0" or 'Retry-After' in response.headers)
+
+    def get(self, url, headers=None):
+        import requests
+
+        for attempt in range(self.retries + 1):
+            self.acquire()
+            response = None
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError):
+                if attempt == self.retries:
+                    raise
+                self.sleep(backoff(attempt))
+                continue
+            finally:
+                self.release(response)
+            last_try = attempt == self.retries
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if self.rate_limited(response) and not last_try:
+                if retry_after is None and self.remaining is not None and self.remaining <= 0:
+                    retry_after = self.reset_at - time.time()
+                if retry_after is None:
+                    retry_after = backoff(attempt)
+                self.pause(max(retry_after, 1), f"Rate limited ({response.status_code})")
+            elif response.status_code in RETRY_STATUSES and not last_try:
+                self.sleep(max(retry_after or 0, backoff(attempt)))
+            else:
+                return response
+
+    def close(self):
+        self.stopped.set()
+        self.session.close()
+
+
+def fetch_activity(usernames, session, pool, api_url=API_URL, cache=None, **filters):
+    # Yields each user's lines as soon as that user's requests finish
+    from concurrent.futures import as_completed
+
+    futures = [pool.submit(get_user_activity, username, session, api_url, cache, **filters)
+               for username in usernames]
+    for future in as_completed(futures):
+        yield future.result()
+
+
+def parse_since(value):
+    # Any ISO 8601 date or time, as a UTC string comparable with created_at
+    import argparse
+    from datetime import datetime, timezone
+
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not an ISO date or time: {value!r}")
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def read_usernames(path):
+    # One username per line; blank lines and # comments are skipped, "-" reads stdin
+    file = sys.stdin if path == "-" else open(path)
+    with file:
+        for line in file:
+            name = line.split("#", 1)[0].strip()
+            if name:
+                yield name
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv:
         print("Please provide the username")
         sys.exit()
 
-    print("Output: ")
-    get_user_activity(sys.argv[1])
-        
-   
+    # Imported after the usage check, which stays as cheap as before
+    import argparse
+    parser = argparse.ArgumentParser(prog="Github-User-Activity.py",
+                                     description="Show the recent public GitHub activity of one or more users")
+    parser.add_argument('usernames', nargs='*', help="GitHub usernames")
+    parser.add_argument('--file', help="Read more usernames from this file (one per line, - for stdin)")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Users fetched at once (default {DEFAULT_CONCURRENCY})")
+    parser.add_argument('--api-url', default=API_URL, help="GitHub API base URL (or set GITHUB_API_URL)")
+    parser.add_argument('--limit', type=int,
+                        help=f"Events shown per user (default {DEFAULT_LIMIT}, or all new ones with --new-only; "
+                             "0 for all the API keeps)")
+    parser.add_argument('--since', type=parse_since,
+                        help="Only events at or after this ISO date/time (UTC unless an offset is given)")
+    parser.add_argument('--type', dest='types', action='append', metavar='TYPE',
+                        help="Only events of this type, e.g. PushEvent (repeatable)")
+    parser.add_argument('--new-only', action='store_true',
+                        help=f"Only show events newer than those seen by the last run (remembered in {STATE_FILE})")
+    parser.add_argument('--watch', action='store_true',
+                        help="Keep polling for new events as often as GitHub's X-Poll-Interval allows (implies --new-only)")
+    parser.add_argument('--stats', action='store_true',
+                        help="Count events per type, repository and day (and commits pushed) instead of listing them")
+    parser.add_argument('--format', choices=['table', 'json'], default='table', help="Output format for --stats")
+    parser.add_argument('--top', type=int, default=10,
+                        help="Types and repositories shown in the --stats table (default 10, 0 for all)")
+    parser.add_argument('--timeout', type=float, default=REQUEST_TIMEOUT,
+                        help=f"Seconds to wait for each response (default {REQUEST_TIMEOUT})")
+    parser.add_argument('--retries', type=int, default=MAX_RETRIES,
+                        help=f"Retries after a 5xx, rate limit or connection error (default {MAX_RETRIES})")
+    parser.add_argument('--no-cache', action='store_true', help="Always download, without the ETag cache")
+    parser.add_argument('--cache-ttl', type=float, default=CACHE_TTL,
+                        help=f"Seconds a cached response is kept (default {CACHE_TTL})")
+    parser.add_argument('--cache-size', type=float, default=CACHE_MAX_BYTES / 2**20,
+                        help=f"Cache size limit in MiB (default {CACHE_MAX_BYTES // 2**20})")
+    args = parser.parse_args(argv)
+
+    usernames = list(args.usernames)
+    if args.file:
+        try:
+            usernames.extend(read_usernames(args.file))
+        except OSError as e:
+            print(f"❌ Cannot read {args.file}: {e}")
+            sys.exit(1)
+    # Each user is fetched once, in the order first given
+    usernames = list(dict.fromkeys(usernames))
+
+    if not usernames:
+        print("Please provide the username")
+        sys.exit()
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.limit is not None and args.limit < 0:
+        parser.error("--limit cannot be negative")
+    if args.timeout <= 0 or args.retries < 0:
+        parser.error("--timeout must be positive and --retries cannot be negative")
+    if args.stats and args.watch:
+        parser.error("--stats cannot be combined with --watch")
+    new_only = args.new_only or args.watch
+    if args.limit is None:
+        args.limit = 0 if new_only or args.stats else DEFAULT_LIMIT
+
+    cache = None
+    if not args.no_cache:
+        try:
+            cache = EventCache(CACHE_DIR, args.cache_ttl, args.cache_size * 2**20)
+        except OSError as e:
+            print(f"⚠️ Cache disabled: {e}")
+
+    state = SeenState() if new_only else None
+    stats = ActivityStats() if args.stats else None
+    # 0 means "everything the API keeps", which the page cap already bounds
+    filters = dict(limit=args.limit or None, since=args.since, types=args.types, state=state, stats=stats)
+    # Keep JSON on stdout parseable; per-user errors go to stderr then
+    out = sys.stderr if stats and args.format == 'json' else sys.stdout
+
+    from concurrent.futures import ThreadPoolExecutor
+    # The session and worker threads are kept across --watch cycles
+    session = RequestScheduler(make_session(args.concurrency), args.timeout, args.retries)
+    pool = ThreadPoolExecutor(max_workers=args.concurrency)
+    if out is sys.stdout:
+        print("Output: ")
+    try:
+        while True:
+            if state:
+                state.start_cycle()
+            for lines in fetch_activity(usernames, session, pool, args.api_url.rstrip("/"), cache, **filters):
+                if lines:
+                    print("\n".join(lines), file=out, flush=True)
+            if state:
+                state.save()
+            if cache:
+                cache.evict()
+            if not args.watch:
+                if stats and args.format == 'json':
+                    print(json.dumps(stats.to_dict(), indent=2))
+                elif stats:
+                    print("\n".join(stats.table(args.top)))
+                elif state and not state.new_events:
+                    print("No new activity.")
+                break
+            wait = state.poll_interval or DEFAULT_POLL_INTERVAL
+            print(f"🕒 {time.strftime('%H:%M:%S')} {state.new_events} new event(s); "
+                  f"next check in {wait}s", flush=True)
+            time.sleep(wait)
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching" if args.watch else "\n👋 Stopped")
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+        session.close()
 
 
 if __name__=='__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,232 @@
+"""
+Local stand-in for the GitHub events API, for trying Github-User-Activity.py
+without network access or rate limits.
+
+GET /users/<name>/events returns a fixed, generated list of events for
+<name>; the user "ghost" does not exist (404). Responses carry an ETag and
+X-Poll-Interval like the real API, and a matching If-None-Match gets an
+empty 304. Feeds are paginated with ?page=&per_page= and a Link header
+(30 per page by default, at most 100, and 300 events per feed, as on
+GitHub). --delay adds latency to every response, so concurrent fetching
+can be compared with sequential. With --grow every user gains a new event
+each given number of seconds, for trying --new-only and --watch.
+
+Failures for exercising retries and rate limiting:
+    --rate-limit N    N requests per --rate-window seconds, with X-RateLimit-*
+                      headers; beyond that 403 "rate limit exceeded"
+    --throttle-every N  every Nth request gets 429 with Retry-After: 1
+    --fail-every N    every Nth request gets 503
+    --hang-every N    every Nth request hangs for a minute before answering
+On exit the server reports how many requests it served over how many
+connections, which shows whether clients reuse keep-alive connections.
+
+Usage:
+    python stub_github.py --port 8765 --delay 0.2 &
+    python Github-User-Activity.py --api-url http://127.0.0.1:8765 alice bob carol
+"""
+import argparse
+import hashlib
+import json
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+EVENT_TYPES = ["PushEvent", "IssuesEvent", "WatchEvent", "ForkEvent", "CreateEvent", "PullRequestEvent"]
+MISSING_USER = "ghost"
+MAX_EVENTS = 300
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def make_event(username, number):
+    """
+    Return the `number`-th event of `username`; higher numbers are newer.
+    """
+    seed = zlib.crc32(f"{username}/{number}".encode())
+    type = EVENT_TYPES[seed % len(EVENT_TYPES)]
+    repo = f"{username}/project-{seed % 5}"
+    payload = {}
+    if type == "PushEvent":
+        payload = {'commits': [{'sha': f"{seed:08x}{i}", 'message': f"Commit {i}"} for i in range(seed % 4 + 1)]}
+    elif type == "IssuesEvent":
+        payload = {'action': "opened", 'issue': {'title': f"Issue {number}"}}
+    elif type == "ForkEvent":
+        payload = {'forkee': {'full_name': f"someone/project-{seed % 5}"}}
+    elif type == "CreateEvent":
+        payload = {'ref_type': "branch", 'ref': f"feature-{number}"}
+    elif type == "PullRequestEvent":
+        payload = {'action': "opened", 'number': number}
+    return {
+        'id': str(zlib.crc32(username.encode()) % 10000 * 100000 + number),
+        'type': type,
+        'actor': {'login': username},
+        'repo': {'name': repo},
+        'payload': payload,
+        'created_at': (EPOCH + timedelta(hours=number)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, body, headers=()):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def count(self, name):
+        with self.server.stats_lock:
+            self.server.stats[name] = self.server.stats.get(name, 0) + 1
+            return self.server.stats[name]
+
+    def rate_limit(self):
+        # Returns (whether the request is allowed, X-RateLimit-* headers)
+        server = self.server
+        with server.stats_lock:
+            now = time.time()
+            if now >= server.window_reset:
+                server.window_reset = int(now) + server.rate_window
+                server.window_used = 0
+            allowed = server.window_used < server.rate_limit
+            server.window_used += allowed
+            headers = [("X-RateLimit-Limit", str(server.rate_limit)),
+                       ("X-RateLimit-Remaining", str(server.rate_limit - server.window_used)),
+                       ("X-RateLimit-Reset", str(server.window_reset))]
+        return allowed, headers
+
+    def failure(self, number):
+        # Answers request `number` with an injected failure; True if it did
+        server = self.server
+        if server.hang_every and number % server.hang_every == 0:
+            self.count('hung')
+            time.sleep(60)
+        if server.throttle_every and number % server.throttle_every == 0:
+            self.count('throttled')
+            self.send_json(429, {'message': "You have exceeded a secondary rate limit."}, [("Retry-After", "1")])
+            return True
+        if server.fail_every and number % server.fail_every == 0:
+            self.count('failed')
+            self.send_json(503, {'message': "Service Unavailable"})
+            return True
+        return False
+
+    def do_GET(self):
+        server = self.server
+        number = self.count('requests')
+        with server.stats_lock:
+            server.connections.add(self.client_address)
+        time.sleep(server.delay)
+        if self.failure(number):
+            return
+        limit_headers = []
+        if server.rate_limit:
+            allowed, limit_headers = self.rate_limit()
+            if not allowed:
+                self.count('rate limited')
+                self.send_json(403, {'message': "API rate limit exceeded"}, limit_headers)
+                return
+
+        path = urlsplit(self.path)
+        query = parse_qs(path.query)
+        parts = path.path.strip("/").split("/")
+        if len(parts) != 3 or parts[0] != "users" or parts[2] != "events":
+            self.send_json(404, {'message': "Not Found"})
+            return
+        username = parts[1]
+        if username == MISSING_USER:
+            self.send_json(404, {'message': "Not Found"})
+            return
+        try:
+            page = max(1, int(query.get('page', ['1'])[0]))
+            per_page = min(100, max(1, int(query.get('per_page', ['30'])[0])))
+        except ValueError:
+            self.send_json(400, {'message': "Bad Request"})
+            return
+        latest = server.events
+        if server.grow:
+            latest += int((time.monotonic() - server.started) / server.grow)
+        # Only the most recent MAX_EVENTS are kept, newest first as on GitHub
+        total = min(latest, MAX_EVENTS)
+        oldest = latest - total
+        newest = latest - (page - 1) * per_page
+        events = [make_event(username, number) for number in range(newest, max(newest - per_page, oldest), -1)]
+        base = f"http://{self.headers.get('Host')}{path.path}?per_page={per_page}&page="
+        last = max(1, -(-total // per_page))
+        links = []
+        if page < last:
+            links.append(f'<{base}{page + 1}>; rel="next"')
+        links.append(f'<{base}{last}>; rel="last"')
+
+        etag = '"%s"' % hashlib.sha1(json.dumps(events).encode()).hexdigest()
+        headers = [("ETag", etag), ("X-Poll-Interval", str(server.poll_interval)),
+                   ("Link", ", ".join(links))] + limit_headers
+        if self.headers.get("If-None-Match") == etag:
+            self.count('not modified')
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            for name, value in headers:
+                self.send_header(name, value)
+            self.end_headers()
+            return
+        self.send_json(200, events, headers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve fake GitHub user events on localhost")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--delay', type=float, default=0.0, help="Seconds to wait before each response")
+    parser.add_argument('--events', type=int, default=90, help=f"Events per user (at most {MAX_EVENTS})")
+    parser.add_argument('--poll-interval', type=int, default=60, help="X-Poll-Interval sent to clients")
+    parser.add_argument('--rate-limit', type=int, default=0, help="Requests allowed per window (default unlimited)")
+    parser.add_argument('--rate-window', type=int, default=60, help="Rate limit window in seconds")
+    parser.add_argument('--throttle-every', type=int, default=0, help="Answer every Nth request with 429")
+    parser.add_argument('--fail-every', type=int, default=0, help="Answer every Nth request with 503")
+    parser.add_argument('--hang-every', type=int, default=0, help="Hang on every Nth request for a minute")
+    parser.add_argument('--grow', type=float, default=0, help="Add a new event per user every this many seconds")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), StubHandler)
+    server.daemon_threads = True
+    server.delay = args.delay
+    server.events = args.events
+    server.poll_interval = args.poll_interval
+    server.grow = args.grow
+    server.started = time.monotonic()
+    server.rate_limit = args.rate_limit
+    server.rate_window = args.rate_window
+    server.window_reset = 0
+    server.window_used = 0
+    server.throttle_every = args.throttle_every
+    server.fail_every = args.fail_every
+    server.hang_every = args.hang_every
+    server.stats = {}
+    server.connections = set()
+    server.stats_lock = threading.Lock()
+    print(f"🧪 Stub GitHub API on http://127.0.0.1:{args.port} (Ctrl+C to stop)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Served {server.stats.get('requests', 0)} requests "
+              f"({server.stats.get('not modified', 0)} not modified) "
+              f"over {len(server.connections)} connections", flush=True)
+        failures = [f"{server.stats[name]} {name}" for name in ('rate limited', 'throttled', 'failed', 'hung')
+                    if name in server.stats]
+        if failures:
+            print(f"Injected: {', '.join(failures)}", flush=True)
+
+
+if __name__ == '__main__':
+    main()
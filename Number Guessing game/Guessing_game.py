@@ -1,50 +1,183 @@
+import os
 import random
 import sys
 import time
 
-# High score tracker per difficulty
-high_scores = {
-    "Easy": None,
-    "Medium": None,
-    "Hard": None
+# The secret number is picked from this range
+LOW = 1
+HIGH = 100
+
+# Difficulty levels by menu choice: (name, number of chances)
+levels = {
+    1: ("Easy", 10),
+    2: ("Medium", 5),
+    3: ("Hard", 3)
 }
 
-def start_game(chance, level_name):
-    # Generate a random number between 1 and 100
-    generate_no = random.randint(1, 100)
-    # Record the start time of the game
-    start_time = time.time()
-    # Initialize attempt counter
-    attempt = 0
+# Every won round is kept here, so high scores survive between sessions
+LEADERBOARD_DB = os.environ.get("GUESSING_GAME_DB", "leaderboard.db")
 
-    # Loop until user runs out of chances
-    while attempt < chance:
+# Scores rank by fewest attempts, then shortest time; the index serves
+# both the best score and top-N queries of a level without a sort
+LEADERBOARD_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    level TEXT NOT NULL,
+    player TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    played_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_by_rank ON scores (level, attempts, duration);
+"""
+
+# Fixes the secret numbers, for repeatable runs (bench_startup.py uses it)
+SEED = os.environ.get("GUESSING_GAME_SEED")
+
+# Players are named on the command line, or after the logged-in user
+DEFAULT_PLAYER = os.environ.get("USER") or os.environ.get("USERNAME") or "Player"
+
+
+class Leaderboard:
+    # High scores in an SQLite database in WAL mode. A win is one row insert
+    # in a short IMMEDIATE transaction, so any number of games can submit at
+    # once without losing scores or rewriting the file
+
+    def __init__(self, path=LEADERBOARD_DB):
+        self.path = path
+        self._conn = None
+
+    @property
+    def conn(self):
+        # Opened on first use, so rounds that aren't won never load sqlite3
+        if self._conn is None:
+            import sqlite3
+            self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(LEADERBOARD_SCHEMA)
+        return self._conn
+
+    def best(self, level):
+        # The top score of a level as (player, attempts, duration, played_at), or None
+        rows = self.top(level, 1)
+        return rows[0] if rows else None
+
+    def top(self, level, n=10):
+        return self.conn.execute(
+            "SELECT player, attempts, duration, played_at FROM scores WHERE level = ? "
+            "ORDER BY attempts, duration LIMIT ?",
+            (level, n),
+        ).fetchall()
+
+    def submit(self, level, player, attempts, duration):
+        # Record a win and return the best score from before it, read in the
+        # same transaction so two games can't both claim the same record
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
         try:
-            # Prompt user for their guess and convert to integer
-            guess_num = int(input("Enter your guess: "))
-        except ValueError:
-            # Handle non-integer input
-            print("Please enter a valid number!")
-            continue
+            best = self.best(level)
+            conn.execute(
+                "INSERT INTO scores (level, player, attempts, duration, played_at) VALUES (?, ?, ?, ?, ?)",
+                (level, player, attempts, duration, time.strftime("%Y-%m-%d %H:%M:%S")),
+            )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return best
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class Game:
+    # The rules of one round, without any input or output
 
-        # Increment attempt counter
-        attempt += 1
+    def __init__(self, chances, secret=None, rng=random):
+        # Generate a random number between LOW and HIGH unless one is given
+        self.secret = rng.randint(LOW, HIGH) if secret is None else secret
+        self.chances = chances
+        self.attempts = 0
+        self.won = False
 
-        if guess_num == generate_no:
+    @property
+    def over(self):
+        # The round ends on a correct guess or when the chances run out
+        return self.won or self.attempts >= self.chances
+
+    def guess(self, number):
+        # 0 if correct, 1 if the secret number is greater, -1 if it is less
+        self.attempts += 1
+        result = (self.secret > number) - (self.secret < number)
+        self.won = result == 0
+        return result
+
+
+class ConsoleInput:
+    # Guess source reading from the keyboard; other sources (such as the
+    # strategies in simulate.py) provide the same two methods
+
+    def next_guess(self):
+        while True:
+            try:
+                # Prompt user for their guess and convert to integer
+                return int(input("Enter your guess: "))
+            except ValueError:
+                # Handle non-integer input; it doesn't use up a chance
+                print("Please enter a valid number!")
+
+    def feedback(self, guess, result):
+        # The player reads the hints printed by start_game instead
+        pass
+
+
+def play(game, source):
+    # Play a round silently; returns the attempts taken, or None if lost
+    while not game.over:
+        guess = source.next_guess()
+        source.feedback(guess, game.guess(guess))
+    return game.attempts if game.won else None
+
+
+def start_game(chance, level_name, source=None, clock=time.time, player=DEFAULT_PLAYER, leaderboard=None):
+    game = Game(chance)
+    source = source or ConsoleInput()
+    # Record the start time of the game
+    start_time = clock()
+
+    # Loop until user runs out of chances
+    while not game.over:
+        guess_num = source.next_guess()
+        result = game.guess(guess_num)
+        source.feedback(guess_num, result)
+        attempt = game.attempts
+
+        if result == 0:
             # Calculate duration taken to guess correctly
-            duration = round((time.time() - start_time), 2)
+            duration = round((clock() - start_time), 2)
             print(f"Congratulations! You guessed the correct number in {attempt} attempts and {duration} seconds")
             
-            # Update high score if it's a new record or first score
-            if high_scores[level_name] is None or attempt < high_scores[level_name]:
-                high_scores[level_name] = attempt
+            # Save the score and compare it with the best one so far
+            import sqlite3
+            leaderboard = leaderboard or Leaderboard()
+            try:
+                best = leaderboard.submit(level_name, player, attempt, duration)
+            except sqlite3.Error as e:
+                print(f"⚠️ Could not save your score: {e}")
+                return
+
+            # It's a new record if it took fewer attempts, or as many in less time
+            if best is None or (attempt, duration) < (best[1], best[2]):
                 print(f"🏆 New high score for {level_name} difficulty!")
             else:
-                print(f"🎯 Current high score for {level_name}: {high_scores[level_name]} attempts.")
+                print(f"🎯 Current high score for {level_name}: {best[1]} attempts "
+                      f"in {best[2]} seconds by {best[0]}.")
 
             return  # End the function if guessed correctly
 
-        elif guess_num < generate_no:
+        elif result > 0:
             # Inform user their guess is too low
             print(f"Incorrect! The number is greater than {guess_num}.")
 
@@ -57,7 +190,38 @@ def start_game(chance, level_name):
         print("🚫 Your chances are over! Better luck next time.")
         
 
-def main():
+def show_leaderboard(leaderboard, n=10):
+    for _, (level_name, _) in sorted(levels.items()):
+        rows = leaderboard.top(level_name, n)
+        print(f"\n🏆 {level_name}")
+        if not rows:
+            print("  No scores yet.")
+        for rank, (player, attempts, duration, played_at) in enumerate(rows, 1):
+            print(f"  {rank:>2}. {player:<16} {attempts:>2} attempts  {duration:>7.2f}s  {played_at}")
+
+
+def main(argv=None):
+    # Usage: Guessing_game.py [player name] | Guessing_game.py leaderboard [N]
+    if argv is None:
+        argv = sys.argv[1:]
+    leaderboard = Leaderboard()
+    if argv[:1] == ["leaderboard"]:
+        try:
+            n = int(argv[1]) if len(argv) > 1 else 10
+        except ValueError:
+            print("Usage: Guessing_game.py leaderboard [N]")
+            sys.exit(1)
+        import sqlite3
+        try:
+            show_leaderboard(leaderboard, n)
+        except sqlite3.Error as e:
+            print(f"❌ Cannot read the leaderboard: {e}")
+            sys.exit(1)
+        return
+    player = " ".join(argv) or DEFAULT_PLAYER
+    if SEED:
+        random.seed(int(SEED))
+
     print(
     """   
 Welcome to the Number Guessing Game!
@@ -72,13 +236,6 @@ Please select the difficulty level:
 3. Hard (3 chances)
             """)
         
-        # Map user input to difficulty and number of chances
-        levels = {
-            1: ("Easy", 10),
-            2: ("Medium", 5),
-            3: ("Hard", 3)
-        }
-        
         while True:
             try:
                 # Prompt user to select difficulty level
@@ -95,7 +252,7 @@ Please select the difficulty level:
         print(f"Great! You have selected the {difficulty} difficulty level.\nLet's start the game!")
         
         # Start the guessing game
-        start_game(chance, difficulty)
+        start_game(chance, difficulty, player=player, leaderboard=leaderboard)
         
         # Ask user if they want to play again
         play_again = input("Do you want to play again? (yes/no): ").strip().lower()
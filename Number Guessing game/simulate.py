@@ -0,0 +1,220 @@
+"""
+Headless simulator for the guessing game: plays rounds with the engine in
+Guessing_game.py, using automated players instead of the keyboard.
+
+Players (--strategy):
+    binary   always guesses the middle of the numbers still possible
+    random   guesses any number still possible, at random
+
+Number pickers (--secret):
+    uniform      a random number, as in the real game
+    adversarial  never commits to a number: every answer keeps the larger
+                 set of candidates, so each guess rules out as little as it
+                 can. This is the worst case for any player.
+
+Every combination of difficulty (from the game's `levels` table), player and
+picker is played --games times. The games are split into batches and run
+across a process pool. The report gives the win rate and the distribution
+of attempts, plus throughput: wall-clock games per second overall, and per
+process for each scenario.
+
+Usage:
+    python simulate.py --games 1000000
+    python simulate.py --level Hard --strategy random --secret adversarial --format json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from Guessing_game import HIGH, LOW, Game, levels, play
+
+# Games per task sent to a worker process; large enough that pickling the
+# results is noise next to playing the games
+BATCH_SIZE = 50_000
+
+
+class BinarySearch:
+    """
+    Guess the middle of the range that is still possible.
+    """
+
+    def __init__(self, rng):
+        self.low, self.high = LOW, HIGH
+
+    def next_guess(self):
+        return (self.low + self.high) // 2
+
+    def feedback(self, guess, result):
+        if result > 0:
+            self.low = guess + 1
+        elif result < 0:
+            self.high = guess - 1
+
+
+class RandomGuess(BinarySearch):
+    """
+    Guess anywhere in the range that is still possible.
+    """
+
+    def __init__(self, rng):
+        super().__init__(rng)
+        self.rng = rng
+
+    def next_guess(self):
+        return self.rng.randint(self.low, self.high)
+
+
+class AdversarialGame(Game):
+    """
+    A round whose secret number is only fixed once it is the last candidate
+    left. Each answer keeps the larger side; ties go to "greater".
+    """
+
+    def __init__(self, chances, rng=random):
+        super().__init__(chances, secret=LOW, rng=rng)
+        self.secret = None
+        self.low, self.high = LOW, HIGH
+
+    def guess(self, number):
+        self.attempts += 1
+        below = max(0, min(self.high, number - 1) - self.low + 1)
+        above = max(0, self.high - max(self.low, number + 1) + 1)
+        if not below and not above:
+            self.secret = number
+            self.won = True
+            return 0
+        if above >= below:
+            self.low = max(self.low, number + 1)
+            return 1
+        self.high = min(self.high, number - 1)
+        return -1
+
+
+STRATEGIES = {'binary': BinarySearch, 'random': RandomGuess}
+SECRETS = {'uniform': Game, 'adversarial': AdversarialGame}
+
+
+def run_batch(chances, strategy, secret, games, seed):
+    """
+    Play `games` rounds in this process. Return (Counter of attempts per
+    won round, rounds lost, CPU seconds).
+    """
+    rng = random.Random(seed)
+    make_game, make_player = SECRETS[secret], STRATEGIES[strategy]
+    wins = Counter()
+    losses = 0
+    start = time.process_time()
+    for _ in range(games):
+        attempts = play(make_game(chances, rng=rng), make_player(rng))
+        if attempts is None:
+            losses += 1
+        else:
+            wins[attempts] += 1
+    return wins, losses, time.process_time() - start
+
+
+def simulate(scenarios, games, workers, seed=None):
+    """
+    Run every (level name, chances, strategy, secret) scenario `games` times
+    across `workers` processes. Return (results per scenario, wall seconds).
+    """
+    seeds = random.Random(seed)
+    results = {scenario: {'wins': Counter(), 'losses': 0, 'cpu_seconds': 0.0} for scenario in scenarios}
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        for scenario in scenarios:
+            _, chances, strategy, secret = scenario
+            for offset in range(0, games, BATCH_SIZE):
+                batch = min(BATCH_SIZE, games - offset)
+                future = pool.submit(run_batch, chances, strategy, secret, batch, seeds.getrandbits(64))
+                futures.append((scenario, future))
+        for scenario, future in futures:
+            wins, losses, cpu_seconds = future.result()
+            result = results[scenario]
+            result['wins'].update(wins)
+            result['losses'] += losses
+            result['cpu_seconds'] += cpu_seconds
+    return results, time.perf_counter() - start
+
+
+def summarize(scenario, result, games):
+    """
+    Return the report for one scenario as a JSON-ready dict.
+    """
+    level, chances, strategy, secret = scenario
+    wins = result['wins']
+    won = sum(wins.values())
+    return {
+        'level': level,
+        'chances': chances,
+        'strategy': strategy,
+        'secret': secret,
+        'games': games,
+        'win_rate': won / games,
+        'mean_attempts': sum(attempts * count for attempts, count in wins.items()) / won if won else None,
+        'attempts': {str(attempts): wins[attempts] for attempts in range(1, chances + 1)},
+        'lost': result['losses'],
+        'games_per_cpu_second': round(games / result['cpu_seconds']) if result['cpu_seconds'] else None,
+    }
+
+
+def print_report(reports, wall_seconds, workers):
+    total = sum(report['games'] for report in reports)
+    for report in reports:
+        mean = f"{report['mean_attempts']:.2f}" if report['mean_attempts'] is not None else "-"
+        print(f"\n🎲 {report['level']} ({report['chances']} chances), {report['strategy']} vs {report['secret']}: "
+              f"won {report['win_rate']:.2%}, mean {mean} attempts, "
+              f"{report['games_per_cpu_second'] or 0:,} games/s per process")
+        rows = list(report['attempts'].items()) + [("lost", report['lost'])]
+        for label, count in rows:
+            share = count / report['games']
+            print(f"  {label:>4}  {share:>7.2%}  {'█' * round(share * 40)}")
+    print(f"\n⏱️ {total:,} games in {wall_seconds:.2f}s on {workers} process(es): "
+          f"{total / wall_seconds:,.0f} games/s")
+
+
+def main():
+    names = [name for name, _ in levels.values()]
+    parser = argparse.ArgumentParser(description="Simulate the number guessing game with automated players")
+    parser.add_argument('--games', type=int, default=100_000, help="Games per scenario (default 100000)")
+    parser.add_argument('--level', action='append', choices=names, help="Difficulty to simulate (repeatable, default all)")
+    parser.add_argument('--strategy', action='append', choices=sorted(STRATEGIES),
+                        help="Player strategy (repeatable, default all)")
+    parser.add_argument('--secret', action='append', choices=sorted(SECRETS),
+                        help="How the number is picked (repeatable, default all)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (default: one per CPU)")
+    parser.add_argument('--seed', type=int, help="Seed for repeatable runs")
+    parser.add_argument('--format', choices=['table', 'json'], default='table')
+    args = parser.parse_args()
+    if args.games < 1 or args.workers < 1:
+        parser.error("--games and --workers must be at least 1")
+
+    scenarios = [
+        (name, chances, strategy, secret)
+        for name, chances in levels.values() if name in (args.level or names)
+        for strategy in args.strategy or sorted(STRATEGIES)
+        for secret in args.secret or sorted(SECRETS, reverse=True)
+    ]
+    try:
+        results, wall_seconds = simulate(scenarios, args.games, args.workers, args.seed)
+    except KeyboardInterrupt:
+        sys.exit(130)
+    reports = [summarize(scenario, results[scenario], args.games) for scenario in scenarios]
+
+    if args.format == 'json':
+        total = len(scenarios) * args.games
+        print(json.dumps({'workers': args.workers, 'wall_seconds': round(wall_seconds, 3),
+                          'games_per_second': round(total / wall_seconds), 'scenarios': reports}, indent=2))
+    else:
+        print_report(reports, wall_seconds, args.workers)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,165 +1,848 @@
 import sys
+import io
 import json
 import os
+import random
+import time
+from bisect import bisect_left, bisect_right
+from contextlib import ExitStack, contextmanager, redirect_stderr, redirect_stdout
 from datetime import datetime
-from prettytable import PrettyTable
-
-TASKS_FILE = 'tasks_py.json'
+from itertools import islice
 
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, writers are not serialised
+    fcntl = None
 
-def load_tasks():
+TASKS_FILE = 'tasks_py.json'
+LOCK_FILE = 'tasks_py.lock'
+INDEX_FILE = 'tasks_py.index'
+SOCKET_FILE = os.environ.get('TASKS_SOCKET', 'tasks_py.sock')
+
+# Attempts at an optimistic read-modify-write before giving up
+MAX_RETRIES = 50
+
+# `serve` keeps the store locked while commands keep arriving and writes it
+# back once it has been idle this long, or held it this long
+FLUSH_DELAY = 0.25
+FLUSH_MAX_HOLD = 2.0
+
+# Set by `serve`/`repl`: the store kept in memory between commands, whether
+# it has unsaved changes, and the (size, mtime) of the file it matches
+hot_store = None
+hot_dirty = False
+hot_stamp = None
+
+# Header, task key and fixed width of each `list` column
+TASK_COLUMNS = [
+    ("Task_ID", 'id', 7),
+    ("Description", 'description', 40),
+    ("Status", 'status', 11),
+    ("Created At", 'created_at', 19),
+    ("Updated At", 'updated_at', 19),
+]
+
+LIST_FORMATS = ('table', 'jsonl', 'tsv')
+
+TASK_STATUSES = ('todo', 'in-progress', 'done')
+SORT_KEYS = ('id', 'updated', '-id', '-updated')
+
+
+class ConflictError(Exception):
+    pass
+
+
+@contextmanager
+def locked(path):
+    with open(path, 'a') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def read_store():
+    if hot_store is not None:
+        return hot_store
     try:
         with open(TASKS_FILE, 'r') as f:
-            return json.load(f)
+            data = json.load(f)
     except FileNotFoundError:
-        return []
+        data = []
     except json.JSONDecodeError:
-        return []
+        data = []
+    # Files written before the header are a bare list of tasks
+    if isinstance(data, list):
+        data = {'version': 0, 'tasks': data}
+    store = {'version': data.get('version', 0), 'next_id': data.get('next_id'), 'tasks': data.get('tasks', [])}
+    if store['next_id'] is None:
+        store['next_id'] = max([task['id'] for task in store['tasks']], default=0) + 1
+    return store
+
+
+def read_store_version():
+    # write_store puts the version on the second line, so a commit only has
+    # to read the file's first bytes; older or hand-edited files are parsed
+    try:
+        with open(TASKS_FILE, 'rb') as f:
+            head = f.read(64).split(b'\n')
+    except FileNotFoundError:
+        return 0
+    if len(head) > 2 and head[0] == b'{':
+        key, _, value = head[1].strip().partition(b':')
+        if key == b'"version"' and value.endswith(b','):
+            try:
+                return int(value[:-1])
+            except ValueError:
+                pass
+    return read_store()['version']
 
 
-def save_tasks(tasks):
-    with open(TASKS_FILE, 'w') as file:
-        json.dump(tasks, file, indent=4)
+def load_tasks():
+    return read_store()['tasks']
+
+
+def write_store(store, version):
+    # One task per line (plain JSON, but compact records keep the fast C
+    # encoder), recording where each task lands so the index can point at it
+    slots = []
+    tmp_file = TASKS_FILE + '.tmp'
+    with open(tmp_file, 'wb') as file:
+        head = f'{{\n    "version": {version},\n    "next_id": {store["next_id"]},\n    "tasks": ['.encode('utf-8')
+        parts, pos = [head], len(head)
+        for task in store['tasks']:
+            body = json.dumps(task).encode('utf-8')
+            separator = b',\n        ' if slots else b'\n        '
+            pos += len(separator)
+            slots.append((task, pos, len(body)))
+            parts += (separator, body)
+            pos += len(body)
+        parts.append(b'\n    ]\n}' if slots else b']\n}')
+        file.write(b''.join(parts))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_file, TASKS_FILE)
+    write_task_index(slots)
+
+
+def write_task_index(slots):
+    # Sidecar: a header line, then one line per status bucket (tasks in ID
+    # order) and one line of all tasks sorted by updated_at. Entries carry
+    # the byte offset and length of the task in TASKS_FILE.
+    buckets = {}
+    for task, offset, length in slots:
+        buckets.setdefault(task['status'], []).append([task['id'], task['updated_at'], offset, length])
+    updated = sorted([task['updated_at'], task['id'], offset, length] for task, offset, length in slots)
+    lines = [json.dumps(entries).encode('utf-8') + b'\n' for entries in list(buckets.values()) + [updated]]
+    spans, pos = [], 0
+    for line in lines:
+        spans.append([pos, len(line)])
+        pos += len(line)
+    stat = os.stat(TASKS_FILE)
+    header = {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'status': dict(zip(buckets, spans)),
+        'updated': spans[-1],
+    }
+    tmp_file = INDEX_FILE + '.tmp'
+    with open(tmp_file, 'wb') as file:
+        file.write(json.dumps(header).encode('utf-8') + b'\n')
+        file.write(b''.join(lines))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_file, INDEX_FILE)
+
+
+def rebuild_task_index():
+    # For stores written by hand or by an older version: rewrite them in the
+    # indexed layout without changing their contents or version
+    with locked(LOCK_FILE):
+        if os.path.exists(TASKS_FILE):
+            store = read_store()
+            write_store(store, store['version'])
+
+
+@contextmanager
+def task_index():
+    # Yields (header, read_entries, read_task) while the index matches the
+    # tasks file, else None. Both files stay open, so a concurrent save
+    # (which renames new files into place) cannot mix two versions.
+    try:
+        tasks_file = open(TASKS_FILE, 'rb')
+    except FileNotFoundError:
+        yield None
+        return
+    with tasks_file:
+        try:
+            index_file = open(INDEX_FILE, 'rb')
+        except FileNotFoundError:
+            yield None
+            return
+        with index_file:
+            try:
+                header = json.loads(index_file.readline())
+            except ValueError:
+                header = None
+            stat = os.fstat(tasks_file.fileno())
+            if not header or (header.get('size'), header.get('mtime_ns')) != (stat.st_size, stat.st_mtime_ns):
+                yield None
+                return
+            body = index_file.tell()
+
+            def read_entries(offset, length):
+                index_file.seek(body + offset)
+                return json.loads(index_file.read(length))
+
+            def read_task(offset, length):
+                tasks_file.seek(offset)
+                return json.loads(tasks_file.read(length))
+
+            yield header, read_entries, read_task
+
+
+def save_tasks(store, expected_version=None):
+    # Commit only if nobody else has saved since `expected_version` was read
+    global hot_dirty
+    if hot_store is not None:
+        # The server holds the lock; flush_hot_store() writes it back later
+        hot_dirty = True
+        return
+    with locked(LOCK_FILE):
+        version = read_store_version()
+        if expected_version is not None and version != expected_version:
+            raise ConflictError(f"tasks changed from version {expected_version} to {version}")
+        write_store(store, version + 1)
+
+
+def transact(mutate):
+    # Optimistic read-modify-write: `mutate` edits the store in place and
+    # returns None when there is nothing to save; conflicts are retried.
+    for attempt in range(MAX_RETRIES):
+        store = read_store()
+        result = mutate(store)
+        if result is None:
+            return None
+        try:
+            save_tasks(store, store['version'])
+            return result
+        except ConflictError:
+            time.sleep(random.uniform(0, 0.01 * (attempt + 1)))
+    raise ConflictError(f"gave up after {MAX_RETRIES} conflicting attempts")
 
 
 def get_time_stamp():
     return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
 
-def create_id():
-    tasks = load_tasks()
-    return max([task['id'] for task in tasks], default=0) + 1
+def create_id(store=None, count=1):
+    # IDs come from the persisted sequence in the file header, so they cost
+    # O(1) and deleted IDs are never handed out again; `count` reserves a batch
+    if store is None:
+        store = read_store()
+    task_id = store['next_id']
+    store['next_id'] += count
+    return task_id
+
+
+def find_task(store, task_id):
+    # id -> list position map, built once per loaded store instead of
+    # scanning the task list on every lookup
+    if 'positions' not in store:
+        store['positions'] = {task['id']: pos for pos, task in enumerate(store['tasks'])}
+    return store['positions'].get(task_id)
 
 
 def add_task(desc):
-    tasks = load_tasks()
-    task = {
-        'id': create_id(),
-        'description': desc,
-        'status': 'todo',
-        'created_at': get_time_stamp(),
-        'updated_at': get_time_stamp()
-    }
-    tasks.append(task)
-    save_tasks(tasks)
+    def add(store):
+        task = {
+            'id': create_id(store),
+            'description': desc,
+            'status': 'todo',
+            'created_at': get_time_stamp(),
+            'updated_at': get_time_stamp()
+        }
+        store['tasks'].append(task)
+        if 'positions' in store:
+            store['positions'][task['id']] = len(store['tasks']) - 1
+        return task
+
+    task = transact(add)
     print("Task added successfully with ID:", task['id'])
 
 
 def delete_task(task_id):
-    tasks = load_tasks()
-    new_tasks = [task for task in tasks if task['id'] != task_id]
-    if len(tasks) == len(new_tasks):
-        print("Task not found.")
-    else:
-        save_tasks(new_tasks)
+    def delete(store):
+        pos = find_task(store, task_id)
+        if pos is None:
+            return None
+        del store['tasks'][pos]
+        store.pop('positions')
+        return True
+
+    if transact(delete):
         print("Task deleted successfully.")
+    else:
+        print("Task not found.")
 
 
 def update_task(task_id, updated_desc):
-    tasks = load_tasks()
-    found = False
-    for task in tasks:
-        if task['id'] == task_id:
-            task['description'] = updated_desc
-            task['updated_at'] = get_time_stamp()
-            found = True
-            break
-    if found:
-        save_tasks(tasks)
+    def update(store):
+        pos = find_task(store, task_id)
+        if pos is None:
+            return None
+        task = store['tasks'][pos]
+        task['description'] = updated_desc
+        task['updated_at'] = get_time_stamp()
+        return True
+
+    if transact(update):
         print("Task updated successfully.")
     else:
         print("Task not found.")
 
 
-def display_all_tasks():
-    tasks = load_tasks()
-    table = PrettyTable()
-    table.field_names = ["Task_ID", "Description", "Status", "Created At", "Updated At"]
-    for task in tasks:
-        table.add_row([task['id'], task['description'], task['status'], task['created_at'], task['updated_at']],divider=True)
-    print(table)
+def parse_ids(args):
+    # "3 4 9-20" -> [3, 4, 9, 10, ..., 20]
+    task_ids = []
+    for arg in args:
+        start, sep, end = arg.partition('-')
+        if not start.isdigit() or (sep and not end.isdigit()):
+            raise ValueError(f"Invalid task ID or range: {arg}")
+        start, end = int(start), int(end) if sep else int(start)
+        if end < start:
+            raise ValueError(f"Invalid task ID range: {arg}")
+        task_ids.extend(range(start, end + 1))
+    return task_ids
+
+
+def parse_ops(lines):
+    # One JSON mutation per line: add/update/mark/delete
+    ops = []
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            op = json.loads(line)
+        except json.JSONDecodeError:
+            raise ValueError(f"line {number}: not valid JSON")
+        if not isinstance(op, dict) or op.get('op') not in ('add', 'update', 'mark', 'delete'):
+            raise ValueError(f"line {number}: 'op' must be add, update, mark or delete")
+        if op['op'] != 'add' and not isinstance(op.get('id'), int):
+            raise ValueError(f"line {number}: '{op['op']}' needs an integer 'id'")
+        if op['op'] in ('add', 'update') and not isinstance(op.get('description'), str):
+            raise ValueError(f"line {number}: '{op['op']}' needs a 'description'")
+        if op['op'] == 'mark' and op.get('status') not in TASK_STATUSES:
+            raise ValueError(f"line {number}: 'status' must be one of: {', '.join(TASK_STATUSES)}")
+        ops.append(op)
+    return ops
+
+
+def apply_ops(store, ops):
+    # Applies every op to the loaded store in memory; deletes are collected
+    # and removed in a single pass at the end
+    stamp = get_time_stamp()
+    deleted = set()
+    result = {'added': [], 'updated': 0, 'deleted': 0, 'missing': []}
+    for op in ops:
+        if op['op'] == 'add':
+            task = {
+                'id': create_id(store),
+                'description': op['description'],
+                'status': 'todo',
+                'created_at': stamp,
+                'updated_at': stamp
+            }
+            store['tasks'].append(task)
+            if 'positions' in store:
+                store['positions'][task['id']] = len(store['tasks']) - 1
+            result['added'].append(task['id'])
+            continue
+        pos = find_task(store, op['id'])
+        if pos is None or op['id'] in deleted:
+            result['missing'].append(op['id'])
+            continue
+        task = store['tasks'][pos]
+        if op['op'] == 'delete':
+            deleted.add(task['id'])
+            result['deleted'] += 1
+            continue
+        if op['op'] == 'update':
+            task['description'] = op['description']
+        else:
+            task['status'] = op['status']
+        task['updated_at'] = stamp
+        result['updated'] += 1
+    if deleted:
+        store['tasks'] = [task for task in store['tasks'] if task['id'] not in deleted]
+        store.pop('positions', None)
+    return result
+
+
+def run_batch(make_ops):
+    # The whole batch is one read-modify-write: one load and one atomic save.
+    # `make_ops(store)` builds the ops from the freshly read store on every retry.
+    result = {}
+
+    def batch(store):
+        result.update(apply_ops(store, make_ops(store)))
+        if result['added'] or result['updated'] or result['deleted']:
+            return result
+        return None
+
+    transact(batch)
+    return result
+
+
+def print_missing(missing):
+    if missing:
+        print("Tasks not found:", ", ".join(str(task_id) for task_id in missing))
+
+
+def add_tasks(descriptions):
+    ops = [{'op': 'add', 'description': desc} for desc in descriptions]
+    result = run_batch(lambda store: ops)
+    print(f"{len(result['added'])} tasks added successfully with IDs: {result['added'][0]}-{result['added'][-1]}")
+
+
+def delete_tasks(task_ids=None, status=None):
+    if status is not None:
+        make_ops = lambda store: [{'op': 'delete', 'id': task['id']} for task in store['tasks'] if task['status'] == status]
+    else:
+        make_ops = lambda store: [{'op': 'delete', 'id': task_id} for task_id in task_ids]
+    result = run_batch(make_ops)
+    print(f"{result['deleted']} tasks deleted successfully.")
+    print_missing(result['missing'])
+
+
+def mark_tasks(task_ids, status):
+    result = run_batch(lambda store: [{'op': 'mark', 'id': task_id, 'status': status} for task_id in task_ids])
+    print(f"{result['updated']} tasks updated to: {status}")
+    print_missing(result['missing'])
 
 
-def display_task_by_status(filtered_status):
+def apply_file(path):
+    if path == '-':
+        ops = parse_ops(sys.stdin)
+    else:
+        with open(path, 'r') as f:
+            ops = parse_ops(f)
+    result = run_batch(lambda store: ops)
+    print(f"Applied {len(ops)} mutations: {len(result['added'])} added, "
+          f"{result['updated']} updated, {result['deleted']} deleted")
+    print_missing(result['missing'])
+
+
+def fit(text, width):
+    if len(text) > width:
+        text = text[:width - 1] + "…"
+    return text.center(width)
+
+
+def render_tasks(tasks, fmt='table', page_size=None):
+    # Rows are written as they are produced; jsonl/tsv skip table layout
+    out = sys.stdout
+    count = 0
+    if fmt == 'jsonl':
+        for task in tasks:
+            out.write(json.dumps(task) + "\n")
+            count += 1
+        return count
+    if fmt == 'tsv':
+        out.write("\t".join(key for _, key, _ in TASK_COLUMNS) + "\n")
+        for task in tasks:
+            out.write("\t".join(str(task[key]).replace("\t", " ").replace("\n", " ") for _, key, _ in TASK_COLUMNS) + "\n")
+            count += 1
+        return count
+
+    border = "+" + "+".join("-" * (width + 2) for _, _, width in TASK_COLUMNS) + "+\n"
+    header = "| " + " | ".join(fit(title, width) for title, _, width in TASK_COLUMNS) + " |\n"
+    for task in tasks:
+        if page_size and count and count % page_size == 0:
+            out.flush()
+            out.write("\n")
+        if count == 0 or (page_size and count % page_size == 0):
+            out.write(border + header + border)
+        out.write("| " + " | ".join(fit(str(task[key]), width) for _, key, width in TASK_COLUMNS) + " |\n")
+        out.write(border)
+        count += 1
+    out.flush()
+    return count
+
+
+def select_entries(index, status=None, since=None, until=None, sort='id'):
+    # Picks [updated_at, id, offset, length] entries from the index: a status
+    # bucket when filtering by status, else a bisected slice of the
+    # updated_at order. Only the chosen tasks are ever read from TASKS_FILE.
+    header, read_entries, _ = index
+    key = sort.lstrip('-')
+    if status is not None:
+        span = header['status'].get(status)
+        entries = [[updated, task_id, offset, length] for task_id, updated, offset, length in (read_entries(*span) if span else [])]
+        entries = [entry for entry in entries if (not since or entry[0] >= since) and (not until or entry[0] <= until)]
+        if key == 'updated':
+            entries.sort()
+    else:
+        entries = read_entries(*header['updated'])
+        low = bisect_left(entries, since, key=lambda entry: entry[0]) if since else 0
+        high = bisect_right(entries, until, key=lambda entry: entry[0]) if until else len(entries)
+        entries = entries[low:high]
+        if key == 'id':
+            entries.sort(key=lambda entry: entry[1])
+    if sort.startswith('-'):
+        entries.reverse()
+    return entries
+
+
+def select_tasks(status=None, since=None, until=None, sort='id', limit=None, offset=0):
+    stop = None if limit is None else offset + limit
+    # A server's unsaved changes are only in memory, so it skips the index
+    for attempt in range(2 if hot_store is None else 0):
+        with task_index() as index:
+            if index is not None:
+                read_task = index[2]
+                for _, _, task_offset, length in islice(select_entries(index, status, since, until, sort), offset, stop):
+                    yield read_task(task_offset, length)
+                return
+        if attempt == 0:
+            rebuild_task_index()
+    # No usable index (e.g. no tasks file yet): filter in memory
+    tasks = [
+        task for task in load_tasks()
+        if (status is None or task['status'] == status)
+        and (not since or task['updated_at'] >= since)
+        and (not until or task['updated_at'] <= until)
+    ]
+    if sort.lstrip('-') == 'updated':
+        tasks.sort(key=lambda task: (task['updated_at'], task['id']))
+    if sort.startswith('-'):
+        tasks.reverse()
+    yield from islice(tasks, offset, stop)
+
+
+def display_all_tasks(limit=None, offset=0, page_size=None, fmt='table', since=None, until=None, sort='id'):
+    if since or until or sort != 'id':
+        render_tasks(select_tasks(None, since, until, sort, limit, offset), fmt, page_size)
+        return
     tasks = load_tasks()
-    table = PrettyTable()
-    table.field_names = ["Task_ID", "Description", "Status", "Created At", "Updated At"]
-    filtered = [task for task in tasks if task['status'] == filtered_status]
-    if not filtered:
+    stop = None if limit is None else offset + limit
+    render_tasks(islice(tasks, offset, stop), fmt, page_size)
+
+
+def display_task_by_status(filtered_status, limit=None, offset=0, page_size=None, fmt='table',
+                           since=None, until=None, sort='id'):
+    filtered = select_tasks(filtered_status, since, until, sort, limit, offset)
+    if not render_tasks(filtered, fmt, page_size) and fmt == 'table':
         print("No tasks found with status:", filtered_status)
-        return
-    for task in filtered:
-        table.add_row([task['id'], task['description'], task['status'], task['created_at'], task['updated_at']],divider=True)
-    print(table)
+
+
+def parse_time_bound(value, end=False):
+    # Accepts "YYYY-MM-DD" or "YYYY-MM-DD HH:MM:SS"; a bare date covers the whole day
+    for pattern in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d'):
+        try:
+            datetime.strptime(value, pattern)
+        except ValueError:
+            continue
+        if pattern == '%Y-%m-%d':
+            value += ' 23:59:59' if end else ' 00:00:00'
+        return value
+    raise ValueError(f"Invalid date: {value} (use YYYY-MM-DD or 'YYYY-MM-DD HH:MM:SS')")
+
+
+def parse_list_args(args):
+    status = None
+    options = {'limit': None, 'offset': 0, 'page-size': None, 'format': 'table',
+               'since': None, 'until': None, 'sort': 'id'}
+    args = iter(args)
+    for arg in args:
+        if not arg.startswith('--'):
+            status = arg
+            continue
+        name = arg[2:]
+        value = next(args, None)
+        if name not in options or value is None:
+            raise ValueError(f"Unknown or incomplete option: {arg}")
+        if name in ('format', 'sort'):
+            options[name] = value
+        elif name in ('since', 'until'):
+            options[name] = parse_time_bound(value, end=name == 'until')
+        elif value.isdigit():
+            options[name] = int(value)
+        else:
+            raise ValueError(f"{arg} expects a non-negative integer")
+    if options['format'] not in LIST_FORMATS:
+        raise ValueError(f"Format must be one of: {', '.join(LIST_FORMATS)}")
+    if options['sort'] not in SORT_KEYS:
+        raise ValueError(f"Sort must be one of: {', '.join(SORT_KEYS)}")
+    return status, {
+        'limit': options['limit'],
+        'offset': options['offset'],
+        'page_size': options['page-size'],
+        'fmt': options['format'],
+        'since': options['since'],
+        'until': options['until'],
+        'sort': options['sort'],
+    }
 
 
 def mark_task(task_id, status):
-    tasks = load_tasks()
-    found = False
-    for task in tasks:
-        if task['id'] == task_id:
-            task['status'] = status
-            task['updated_at'] = get_time_stamp()
-            found = True
-            break
-    if found:
-        save_tasks(tasks)
+    def mark(store):
+        pos = find_task(store, task_id)
+        if pos is None:
+            return None
+        task = store['tasks'][pos]
+        task['status'] = status
+        task['updated_at'] = get_time_stamp()
+        return True
+
+    if transact(mark):
         print("Task status updated to:", status)
     else:
         print("Task not found.")
 
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage:\n  add <desc>\n  delete <id>\n  update <id> <desc>\n  list [status]\n  mark-in-progress <id>\n  mark-done <id>")
+def file_stamp():
+    try:
+        stat = os.stat(TASKS_FILE)
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def load_hot_store():
+    # Called with the lock held: re-read the file only if someone else saved
+    global hot_store, hot_stamp
+    stamp = file_stamp()
+    if hot_store is None or stamp != hot_stamp:
+        hot_store = None
+        hot_store = read_store()
+        hot_stamp = stamp
+
+
+def flush_hot_store():
+    global hot_dirty, hot_stamp
+    if hot_dirty:
+        hot_store['version'] += 1
+        write_store(hot_store, hot_store['version'])
+        hot_dirty = False
+        hot_stamp = file_stamp()
+
+
+def run_command(argv, stdin=''):
+    output = io.StringIO()
+    saved_stdin, sys.stdin = sys.stdin, io.StringIO(stdin)
+    try:
+        with redirect_stdout(output), redirect_stderr(output):
+            main(['Task-Tracker.py'] + argv)
+    except SystemExit:
+        pass
+    finally:
+        sys.stdin = saved_stdin
+    return output.getvalue()
+
+
+def read_request(conn):
+    chunks = []
+    while chunk := conn.recv(65536):
+        chunks.append(chunk)
+    return json.loads(b''.join(chunks))
+
+
+def serve(path=SOCKET_FILE):
+    # Runs the commands task_client.py forwards, one at a time, against the
+    # store kept in memory. The lock is taken by the first command and held
+    # while commands keep arriving; the store is written back once after
+    # FLUSH_DELAY of idle time (FLUSH_MAX_HOLD at the latest).
+    global hot_store
+    import socket
+    if not hasattr(socket, 'AF_UNIX'):
+        print("serve needs Unix domain sockets")
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+        print("A server is already listening on", path)
+        return
+    except OSError:
+        if os.path.exists(path):
+            os.remove(path)
+    finally:
+        probe.close()
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(64)
+    hold = ExitStack()
+    held_since = None
+
+    def release():
+        nonlocal held_since
+        if held_since is not None:
+            flush_hot_store()
+            hold.close()
+            held_since = None
+
+    print("Serving tasks on", path, "(Ctrl+C to stop)", flush=True)
+    try:
+        while True:
+            if held_since is None:
+                server.settimeout(None)
+            else:
+                server.settimeout(max(0, min(FLUSH_DELAY, held_since + FLUSH_MAX_HOLD - time.monotonic())))
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                release()
+                continue
+            with conn:
+                conn.settimeout(5)
+                try:
+                    request = read_request(conn)
+                    if held_since is None:
+                        hold.enter_context(locked(LOCK_FILE))
+                        held_since = time.monotonic()
+                        load_hot_store()
+                    conn.sendall(run_command(request['argv'], request.get('stdin', '')).encode('utf-8'))
+                except (OSError, ValueError, KeyError):
+                    pass
+            if held_since is not None and time.monotonic() - held_since >= FLUSH_MAX_HOLD:
+                release()
+    except KeyboardInterrupt:
+        print("\nServer stopped")
+    finally:
+        release()
+        hot_store = None
+        server.close()
+        os.remove(path)
+
+
+def repl():
+    # Each command commits on its own; the parsed store stays in memory
+    # between commands unless another process changes the file
+    global hot_store
+    import shlex
+    print("Task tracker shell. Type a command (e.g. `list todo`), `help` or `exit`.")
+    try:
+        while True:
+            try:
+                line = input("tasks> ")
+            except (EOFError, KeyboardInterrupt):
+                print()
+                return
+            if line.strip() in ('exit', 'quit'):
+                return
+            try:
+                argv = shlex.split(line)
+            except ValueError as e:
+                print(e)
+                continue
+            if not argv:
+                continue
+            with locked(LOCK_FILE):
+                load_hot_store()
+                print(run_command([] if argv == ['help'] else argv), end='')
+                flush_hot_store()
+    finally:
+        hot_store = None
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv
+    if len(argv) < 2:
+        print("Usage:\n  add <desc>|-\n  delete <id>...|--status <status>\n  update <id> <desc>\n"
+              "  list [status] [--limit N] [--offset N] [--page-size N] [--format table|jsonl|tsv]\n"
+              "       [--since DATE] [--until DATE] [--sort id|updated|-id|-updated]\n"
+              "  mark-in-progress <id>...\n  mark-done <id>...\n  apply <file.jsonl>|-\n"
+              "  serve [--socket PATH]\n  repl\n"
+              "IDs may be ranges such as 9-20; '-' reads from stdin")
         sys.exit(1)
 
-    command = sys.argv[1].lower()
+    command = argv[1].lower()
 
     try:
         match command:
             case "add":
-                if len(sys.argv) < 3:
+                if len(argv) >= 3 and argv[2] != '-':
+                    add_task(argv[2])
+                    return
+                # One description per line from stdin, when it is piped or given as '-'
+                descriptions = []
+                if len(argv) >= 3 or not sys.stdin.isatty():
+                    descriptions = [line.strip() for line in sys.stdin if line.strip()]
+                if not descriptions:
                     print("Please provide the task description")
                 else:
-                    add_task(sys.argv[2])
+                    add_tasks(descriptions)
 
             case "delete":
-                if len(sys.argv) < 3:
+                if len(argv) < 3:
                     print("Please provide the task ID")
+                elif argv[2] == '--status':
+                    if len(argv) < 4 or argv[3] not in TASK_STATUSES:
+                        print("Status must be one of:", ", ".join(TASK_STATUSES))
+                    else:
+                        delete_tasks(status=argv[3])
+                elif len(argv) == 3 and argv[2].isdigit():
+                    delete_task(int(argv[2]))
                 else:
-                    delete_task(int(sys.argv[2]))
+                    delete_tasks(parse_ids(argv[2:]))
 
             case "update":
-                if len(sys.argv) < 4:
+                if len(argv) < 4:
                     print("Please provide task ID and new description")
                 else:
-                    update_task(int(sys.argv[2]), sys.argv[3])
+                    update_task(int(argv[2]), argv[3])
 
             case "list":
-                if len(sys.argv) == 2:
-                    display_all_tasks()
+                try:
+                    status, options = parse_list_args(argv[2:])
+                except ValueError as e:
+                    print(e)
+                    return
+                if status is None:
+                    display_all_tasks(**options)
                 else:
-                    status = sys.argv[2]
-                    display_task_by_status(status)
+                    display_task_by_status(status, **options)
 
-            case "mark-in-progress":
-                if len(sys.argv) < 3:
+            case "mark-in-progress" | "mark-done":
+                status = command.removeprefix("mark-")
+                if len(argv) < 3:
                     print("Please provide the task ID")
+                elif len(argv) == 3 and argv[2].isdigit():
+                    mark_task(int(argv[2]), status)
                 else:
-                    mark_task(int(sys.argv[2]), "in-progress")
+                    mark_tasks(parse_ids(argv[2:]), status)
 
-            case "mark-done":
-                if len(sys.argv) < 3:
-                    print("Please provide the task ID")
+            case "serve" | "repl":
+                if hot_store is not None:
+                    print("Already running inside a server or shell")
+                elif command == "repl":
+                    repl()
                 else:
-                    mark_task(int(sys.argv[2]), "done")
+                    serve(argv[3] if len(argv) > 3 and argv[2] == '--socket' else SOCKET_FILE)
+
+            case "apply":
+                if len(argv) < 3:
+                    print("Please provide a JSONL file of mutations (or - for stdin)")
+                    return
+                try:
+                    apply_file(argv[2])
+                except (ValueError, OSError) as e:
+                    print("Nothing applied:", e)
 
             case _:
                 print("Invalid command")
 
     except ValueError:
         print("Invalid input (ID should be an integer)")
+    except ConflictError as e:
+        print("Tasks are being changed by another process, please retry:", e)
+    except BrokenPipeError:
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
 
 
 if __name__ == '__main__':
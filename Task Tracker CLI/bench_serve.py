@@ -0,0 +1,100 @@
+"""
+Benchmark per-command latency of the cold CLI against `serve`.
+
+For each command it reports the median wall time of:
+  cold    - `python Task-Tracker.py ...` (start-up and store load)
+  client  - `python task_client.py ...` talking to a running server
+  socket  - one request sent straight to the server socket (no interpreter start)
+
+Usage:
+    python bench_serve.py [--tasks 100000] [--repeat 20]
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SCRIPT = os.path.join(HERE, "Task-Tracker.py")
+CLIENT = os.path.join(HERE, "task_client.py")
+SOCKET_FILE = 'tasks_py.sock'
+
+COMMANDS = [
+    ["add", "Benchmark"],
+    ["mark-done", "1"],
+    ["list", "in-progress", "--format", "tsv"],
+]
+
+
+def make_store(count):
+    stamp = '2024-01-01 00:00:00'
+    tasks = [
+        {'id': i, 'description': f"Task {i}", 'status': 'in-progress' if i % 1000 == 0 else 'todo',
+         'created_at': stamp, 'updated_at': stamp}
+        for i in range(1, count + 1)
+    ]
+    with open('tasks_py.json', 'w') as f:
+        json.dump({'version': 0, 'next_id': count + 1, 'tasks': tasks}, f, indent=4)
+
+
+def time_process(argv, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def time_socket(argv, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(SOCKET_FILE)
+            client.sendall(json.dumps({'argv': argv}).encode('utf-8'))
+            client.shutdown(socket.SHUT_WR)
+            while client.recv(65536):
+                pass
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold CLI vs serve latency")
+    parser.add_argument('--tasks', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            make_store(args.tasks)
+            cold = [time_process([sys.executable, SCRIPT] + argv, args.repeat) for argv in COMMANDS]
+
+            server = subprocess.Popen([sys.executable, SCRIPT, "serve"], stdout=subprocess.DEVNULL)
+            try:
+                while not os.path.exists(SOCKET_FILE):
+                    time.sleep(0.01)
+                warm = [time_process([sys.executable, CLIENT] + argv, args.repeat) for argv in COMMANDS]
+                raw = [time_socket(argv, args.repeat) for argv in COMMANDS]
+            finally:
+                server.send_signal(signal.SIGINT)
+                server.wait()
+        finally:
+            os.chdir(cwd)
+
+    print(f"{'command':<10}  {'cold (ms)':>10}  {'client (ms)':>12}  {'socket (ms)':>12}")
+    for argv, c, w, r in zip(COMMANDS, cold, warm, raw):
+        print(f"{argv[0]:<10}  {c * 1000:>10.2f}  {w * 1000:>12.2f}  {r * 1000:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Multi-process stress test for concurrent `add` commands.
+
+Starts hundreds of `Task-Tracker.py add` processes at once against an empty
+store in a temporary directory, then checks that every task was kept and
+that no task ID was handed out twice.
+
+Usage:
+    python stress_add.py [--processes 200]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Task-Tracker.py")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stress-test concurrent task adds")
+    parser.add_argument('--processes', type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        procs = [
+            subprocess.Popen(
+                [sys.executable, SCRIPT, "add", f"stress {i}"],
+                cwd=workdir, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+            )
+            for i in range(args.processes)
+        ]
+        succeeded = 0
+        for proc in procs:
+            output, _ = proc.communicate()
+            if "successfully" in output:
+                succeeded += 1
+            else:
+                print(f"⚠️ add failed: {output.strip()}")
+
+        listing = subprocess.run(
+            [sys.executable, SCRIPT, "list", "--format", "jsonl"],
+            cwd=workdir, capture_output=True, text=True, check=True,
+        ).stdout
+        ids = [json.loads(line)['id'] for line in listing.splitlines()]
+
+    duplicates = len(ids) - len(set(ids))
+    print(f"processes: {args.processes}  succeeded: {succeeded}  stored: {len(ids)}  duplicate IDs: {duplicates}")
+    if succeeded != args.processes or len(ids) != args.processes or duplicates:
+        print("❌ Lost writes or duplicate IDs detected")
+        sys.exit(1)
+    print("✅ No lost writes and no duplicate IDs")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""
+Thin client for `Task-Tracker.py serve`.
+
+Forwards its arguments (and piped stdin for `add` / `apply -`) to the
+server listening on the Unix socket in the current directory and prints
+the reply. When no server is listening it runs Task-Tracker.py itself.
+
+Usage:
+    python Task-Tracker.py serve &
+    python task_client.py add "Buy groceries"
+"""
+import json
+import os
+import socket
+import sys
+
+SOCKET_FILE = os.environ.get('TASKS_SOCKET', 'tasks_py.sock')
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Task-Tracker.py")
+
+
+def main():
+    argv = sys.argv[1:]
+    try:
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.connect(SOCKET_FILE)
+    except (AttributeError, OSError):
+        # No server: fall back to the regular CLI
+        os.execv(sys.executable, [sys.executable, SCRIPT] + argv)
+    stdin = ''
+    if '-' in argv or (argv == ['add'] and not sys.stdin.isatty()):
+        stdin = sys.stdin.read()
+    with client:
+        client.sendall(json.dumps({'argv': argv, 'stdin': stdin}).encode('utf-8'))
+        client.shutdown(socket.SHUT_WR)
+        while chunk := client.recv(65536):
+            sys.stdout.buffer.write(chunk)
+    sys.stdout.flush()
+
+
+if __name__ == '__main__':
+    main()
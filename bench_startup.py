@@ -0,0 +1,251 @@
+"""
+Start-up time benchmark for every subcommand of the four CLI tools.
+
+Each command runs under `python -X importtime` in a scratch directory with
+a small fixture store. The self import times reported on stderr are summed
+to give the import cost of the command, leaving out the modules a bare
+interpreter imports anyway (site, encodings, ...), which are machine noise.
+The best of --repeat runs is kept; wall time is the median.
+Results are compared with startup_baseline.json and the script exits with
+status 1 if any command's import cost grows by more than --threshold
+(plus a small absolute allowance for noise), or if the script gains a
+direct import costing over 2 ms that its baseline does not have.
+
+The GitHub command is pointed at a closed local proxy port, so it goes
+through its whole network path without leaving the machine. The game is
+seeded so its fixed guesses always lose the round (a win would also load
+the leaderboard).
+
+Usage:
+    python bench_startup.py                 # compare against the baseline
+    python bench_startup.py --update        # record a new baseline
+    python bench_startup.py --only expense  # one tool
+"""
+import argparse
+import json
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(ROOT, "startup_baseline.json")
+
+EXPENSE = os.path.join(ROOT, "Expense Tracker", "Expense_tracker.py")
+TASKS = os.path.join(ROOT, "Task Tracker CLI", "Task-Tracker.py")
+GITHUB = os.path.join(ROOT, "Github User Activty CLI", "Github-User-Activity.py")
+GAME = os.path.join(ROOT, "Number Guessing game", "Guessing_game.py")
+
+# A direct import missing from the baseline is reported by name once it
+# costs this much (cumulative, in microseconds)
+HEAVY_IMPORT_US = 2000
+
+# (tool, name, script, argv, stdin); argv may name a socket to wait for
+COMMANDS = [
+    ("expense", "help", EXPENSE, ["--help"], ""),
+    ("expense", "add", EXPENSE, ["add", "--description", "Bench", "--amount", "1", "--category", "Food"], ""),
+    ("expense", "delete", EXPENSE, ["delete", "--id", "1"], ""),
+    ("expense", "list", EXPENSE, ["list", "--format", "tsv"], ""),
+    ("expense", "summary", EXPENSE, ["summary", "--month", "1"], ""),
+    ("expense", "budget", EXPENSE, ["budget", "--month", "1", "--amount", "500"], ""),
+    ("expense", "budget-status", EXPENSE, ["budget", "status"], ""),
+    ("expense", "export", EXPENSE, ["export", "--filename", "out.csv"], ""),
+    ("expense", "import", EXPENSE, ["import", "--filename", "in.jsonl"], ""),
+    ("expense", "compact", EXPENSE, ["compact"], ""),
+    ("expense", "reindex", EXPENSE, ["reindex"], ""),
+    ("expense", "migrate", EXPENSE, ["migrate", "--to", "bench.db"], ""),
+    ("expense", "repl", EXPENSE, ["repl"], "exit\n"),
+    ("expense", "serve", EXPENSE, ["serve"], "cart_list.sock"),
+    ("tasks", "usage", TASKS, [], ""),
+    ("tasks", "add", TASKS, ["add", "Bench"], ""),
+    ("tasks", "update", TASKS, ["update", "1", "Bench again"], ""),
+    ("tasks", "delete", TASKS, ["delete", "2"], ""),
+    ("tasks", "list", TASKS, ["list", "--format", "tsv"], ""),
+    ("tasks", "list-status", TASKS, ["list", "done", "--format", "tsv"], ""),
+    ("tasks", "mark-in-progress", TASKS, ["mark-in-progress", "3"], ""),
+    ("tasks", "mark-done", TASKS, ["mark-done", "3"], ""),
+    ("tasks", "apply", TASKS, ["apply", "ops.jsonl"], ""),
+    ("tasks", "repl", TASKS, ["repl"], "exit\n"),
+    ("tasks", "serve", TASKS, ["serve"], "tasks_py.sock"),
+    ("github", "usage", GITHUB, [], ""),
+    # No retries: backoff sleeps against the closed proxy aren't start-up time
+    ("github", "user", GITHUB, ["octocat", "--retries", "0"], ""),
+    ("game", "round", GAME, [], "3\n50\n25\n75\nno\n"),
+    ("game", "leaderboard", GAME, ["leaderboard"], ""),
+]
+
+
+def make_fixtures(workdir):
+    """
+    Write small stores for the trackers into `workdir`.
+    """
+    expenses = [
+        {'id': i, 'date': "2024-01-15", 'description': f"Expense {i}", 'amount': 1.0, 'category': "Food"}
+        for i in range(1, 51)
+    ]
+    with open(os.path.join(workdir, "cart_list.json"), 'w') as f:
+        json.dump(expenses, f, indent=2)
+    with open(os.path.join(workdir, "monthly_budget.json"), 'w') as f:
+        json.dump([{'month': m, 'amount': 1e9} for m in range(1, 13)], f)
+    with open(os.path.join(workdir, "in.jsonl"), 'w') as f:
+        f.write(json.dumps({'date': "2024-01-16", 'description': "Imported", 'amount': 2, 'category': "Food"}) + "\n")
+
+    stamp = "2024-01-01 00:00:00"
+    tasks = [
+        {'id': i, 'description': f"Task {i}", 'status': 'done' if i % 2 else 'todo',
+         'created_at': stamp, 'updated_at': stamp}
+        for i in range(1, 51)
+    ]
+    with open(os.path.join(workdir, "tasks_py.json"), 'w') as f:
+        json.dump(tasks, f, indent=4)
+    with open(os.path.join(workdir, "ops.jsonl"), 'w') as f:
+        f.write(json.dumps({'op': 'mark', 'id': 4, 'status': 'done'}) + "\n")
+
+
+def parse_importtime(stderr):
+    """
+    Yield (module, nesting depth, self us, cumulative us) per imported module
+    from `-X importtime` output. Depth 0 is a direct import of the script.
+    """
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        yield name.strip(), depth, int(self_us), int(cumulative_us)
+
+
+def import_profile(stderr, skip):
+    """
+    Return (total self import time, {direct import: cumulative time}) in
+    microseconds, ignoring modules in `skip`.
+    """
+    total, direct = 0, {}
+    for name, depth, self_us, cumulative_us in parse_importtime(stderr):
+        if name in skip:
+            continue
+        total += self_us
+        if depth == 0:
+            direct[name] = cumulative_us
+    return total, direct
+
+
+def interpreter_modules():
+    """
+    Return the modules a bare interpreter imports before running anything.
+    """
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", "pass"],
+                            capture_output=True, text=True).stderr
+    return frozenset(name for name, *_ in parse_importtime(stderr))
+
+
+def run_once(script, argv, stdin, workdir, skip):
+    """
+    Run one command and return (wall seconds, import profile).
+    For `serve`, `stdin` names the socket: wall time is time to ready.
+    """
+    # Seed 1 makes the game's secret 18, which the game/round guesses miss
+    env = dict(os.environ, HTTPS_PROXY="http://127.0.0.1:9", HTTP_PROXY="http://127.0.0.1:9",
+               GUESSING_GAME_SEED="1")
+    command = [sys.executable, "-X", "importtime", script] + argv
+    start = time.perf_counter()
+    if argv == ["serve"]:
+        socket_path = os.path.join(workdir, stdin)
+        proc = subprocess.Popen(command, cwd=workdir, env=env, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.PIPE, text=True)
+        while not os.path.exists(socket_path):
+            time.sleep(0.001)
+        wall = time.perf_counter() - start
+        proc.send_signal(signal.SIGINT)
+        _, stderr = proc.communicate()
+    else:
+        proc = subprocess.run(command, cwd=workdir, env=env, input=stdin, stdout=subprocess.DEVNULL,
+                              stderr=subprocess.PIPE, text=True)
+        wall = time.perf_counter() - start
+        stderr = proc.stderr
+    return wall, import_profile(stderr, skip)
+
+
+def measure(commands, repeat):
+    """
+    Return {"tool/name": result} with the best import time, the median
+    wall time and the cost of each direct import.
+    Every run gets fresh fixtures so mutating commands see the same store.
+    """
+    results = {}
+    skip = interpreter_modules()
+    for tool, name, script, argv, stdin in commands:
+        walls, imports, direct = [], [], {}
+        for _ in range(repeat):
+            with tempfile.TemporaryDirectory() as workdir:
+                make_fixtures(workdir)
+                wall, (import_us, modules) = run_once(script, argv, stdin, workdir, skip)
+            walls.append(wall)
+            imports.append(import_us)
+            for module, cumulative in modules.items():
+                direct[module] = min(cumulative, direct.get(module, cumulative))
+        results[f"{tool}/{name}"] = {
+            'import_us': min(imports),
+            'wall_ms': round(statistics.median(walls) * 1000, 2),
+            'imports': dict(sorted(direct.items())),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CLI start-up time against a baseline")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="Allowed relative growth of import time (default 0.25 = 25%%)")
+    parser.add_argument('--slack-ms', type=float, default=2.0,
+                        help="Absolute import time growth always tolerated, for noise")
+    parser.add_argument('--only', choices=sorted({tool for tool, *_ in COMMANDS}), help="Benchmark one tool")
+    parser.add_argument('--update', action='store_true', help=f"Write the results to {os.path.basename(BASELINE_FILE)}")
+    args = parser.parse_args()
+
+    commands = [command for command in COMMANDS if args.only in (None, command[0])]
+    results = measure(commands, args.repeat)
+
+    try:
+        with open(BASELINE_FILE) as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        baseline = {}
+
+    regressions = []
+    print(f"{'command':<24}  {'import (ms)':>11}  {'baseline':>9}  {'wall (ms)':>10}")
+    for key, result in results.items():
+        base = baseline.get(key)
+        base_ms = f"{base['import_us'] / 1000:>9.2f}" if base else f"{'-':>9}"
+        print(f"{key:<24}  {result['import_us'] / 1000:>11.2f}  {base_ms}  {result['wall_ms']:>10.2f}")
+        if not base:
+            continue
+        limit_us = base['import_us'] * (1 + args.threshold) + args.slack_ms * 1000
+        if result['import_us'] > limit_us:
+            regressions.append(f"{key}: imports take {result['import_us'] / 1000:.2f} ms "
+                               f"(baseline {base['import_us'] / 1000:.2f} ms)")
+        new_heavy = sorted(module for module, cumulative in result['imports'].items()
+                           if module not in base['imports'] and cumulative >= HEAVY_IMPORT_US)
+        if new_heavy:
+            regressions.append(f"{key}: new heavy imports: {', '.join(new_heavy)}")
+
+    if args.update:
+        baseline.update(results)
+        with open(BASELINE_FILE, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline written to {BASELINE_FILE}")
+        return
+    if regressions:
+        print("\nStart-up regressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print("\nNo start-up regressions")
+
+
+if __name__ == '__main__':
+    main()